@@ -16,21 +16,52 @@
 #   limitations under the License.
 
 from . import (
+    _async_dict,
+    _compact_dict,
+    _concurrency,
     _dict,
+    _fingerprinted_dict,
+    _frozen_compact_dict,
     _frozen_dict,
+    _frozen_fingerprinted_dict,
+    _frozen_mapped_dict,
+    _frozen_shared_dict,
     _frozen_tolerant_dict,
+    _frozen_value_indexed_dict,
+    _instrumentation,
     _items_view,
     _keys_view,
     _tolerant_dict,
+    _value_indexed_dict,
     _values_view,
     _version,
 )
+from ._async_dict import AsyncMagicDict  # noqa: F401
+from ._compact_dict import CompactMagicDict  # noqa: F401
+from ._concurrency import Concurrency  # noqa: F401
 from ._dict import MagicDict  # noqa: F401
-from ._frozen_dict import FrozenMagicDict  # noqa: F401
+from ._fingerprinted_dict import FingerprintedMagicDict  # noqa: F401
+from ._frozen_compact_dict import FrozenCompactMagicDict  # noqa: F401
+from ._frozen_dict import FrozenMagicDict, StorageStats  # noqa: F401
+from ._frozen_fingerprinted_dict import (  # noqa: F401
+    FrozenFingerprintedMagicDict,
+)
+from ._frozen_mapped_dict import FrozenMappedMagicDict  # noqa: F401
+from ._frozen_shared_dict import FrozenSharedMagicDict  # noqa: F401
 from ._frozen_tolerant_dict import FrozenTolerantMagicDict  # noqa: F401
+from ._frozen_value_indexed_dict import (  # noqa: F401
+    FrozenValueIndexedMagicDict,
+)
+from ._instrumentation import (  # noqa: F401
+    Instrumentation,
+    InstrumentationSnapshot,
+    LockStats,
+    OperationStats,
+)
 from ._items_view import MagicItemsView  # noqa: F401
 from ._keys_view import MagicKeysView  # noqa: F401
 from ._tolerant_dict import TolerantMagicDict  # noqa: F401
+from ._value_indexed_dict import ValueIndexedMagicDict  # noqa: F401
 from ._values_view import MagicValuesView  # noqa: F401
 from ._version import __version__  # noqa: F401
 
@@ -43,4 +74,15 @@ __all__ = (
     + _frozen_tolerant_dict.__all__
     + _dict.__all__
     + _tolerant_dict.__all__
+    + _frozen_value_indexed_dict.__all__
+    + _value_indexed_dict.__all__
+    + _concurrency.__all__
+    + _async_dict.__all__
+    + _frozen_compact_dict.__all__
+    + _compact_dict.__all__
+    + _frozen_shared_dict.__all__
+    + _frozen_mapped_dict.__all__
+    + _instrumentation.__all__
+    + _frozen_fingerprinted_dict.__all__
+    + _fingerprinted_dict.__all__
 )
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#   Copyright 2021 Kaede Hoshikawa
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+import asyncio
+import typing
+
+from ._concurrency import Concurrency
+from ._dict import MagicDict
+
+__all__ = ["AsyncMagicDict"]
+
+_K = TypeVar("_K")
+
+_V = TypeVar("_V")
+
+
+class AsyncMagicDict(MagicDict[_K, _V], Generic[_K, _V]):
+    """
+    A `MagicDict` to be shared between the tasks of an event loop.
+
+    It does not lock, so it must only be used in the thread running the
+    event loop. Tasks can wait for a key to be added with `wait_for` and
+    follow the values of a key with `get_aiter`.
+    """
+
+    __slots__ = ("_watchers",)
+
+    concurrency = Concurrency.NONE
+
+    def _init_instance(self) -> None:
+        # Callbacks called with each value added to a key.
+        self._watchers: Dict[_K, List[Callable[[_V], None]]] = {}
+
+        super()._init_instance()
+
+    def _watch(self, key: _K, watcher: Callable[[_V], None]) -> None:
+        watchers = self._watchers.get(key)
+
+        if watchers is None:
+            self._watchers[key] = [watcher]
+
+        else:
+            watchers.append(watcher)
+
+    def _unwatch(self, key: _K, watcher: Callable[[_V], None]) -> None:
+        watchers = self._watchers[key]
+        watchers.remove(watcher)
+
+        if not watchers:
+            del self._watchers[key]
+
+    def _notify(self, pairs: Iterable[Tuple[_K, _V]]) -> None:
+        """
+        Call the watchers with the pairs that have been added, their keys
+        have already been altered.
+        """
+        watchers = self._watchers
+
+        for key, value in pairs:
+            if key in watchers:
+                # Watchers may remove themselves.
+                for watcher in watchers[key].copy():
+                    watcher(value)
+
+    def _add_one(self, key: _K, value: _V) -> None:
+        super()._add_one(key, value)
+
+        if self._watchers:
+            self._notify(((self._alter_key(key), value),))
+
+    def _append_pair(self, key: _K, value: _V) -> None:
+        super()._append_pair(key, value)
+
+        if self._watchers:
+            self._notify(((key, value),))
+
+    def _add_pairs(
+        self, pairs: Iterable[Tuple[Any, Any]], keys_altered: bool = False
+    ) -> None:
+        if not self._watchers:
+            super()._add_pairs(pairs, keys_altered)
+
+            return
+
+        if not isinstance(pairs, list):
+            pairs = list(pairs)
+
+        super()._add_pairs(pairs, keys_altered)
+
+        if not keys_altered:
+            alter_key = self._alter_key
+            pairs = [(alter_key(key), value) for key, value in pairs]
+
+        self._notify(pairs)
+
+    def _add_storage(self, storage: Tuple[Any, ...]) -> None:
+        super()._add_storage(storage)
+
+        if self._watchers:
+            self._notify(self._iter_pairs())
+
+    async def wait_for(self, key: _K) -> _V:
+        """
+        Wait until a value is added to the key and return it.
+
+        If the key is already in the dictionary, the first value is returned
+        immediately.
+        """
+        key = self._alter_key(key)
+
+        try:
+            return self[key]
+
+        except KeyError:
+            pass
+
+        fut: "asyncio.Future[_V]" = asyncio.get_event_loop().create_future()
+
+        def _watcher(value: _V) -> None:
+            if not fut.done():
+                fut.set_result(value)
+
+        self._watch(key, _watcher)
+
+        try:
+            return await fut
+
+        finally:
+            self._unwatch(key, _watcher)
+
+    async def get_aiter(self, key: _K) -> AsyncIterator[_V]:
+        """
+        Get an asynchronous iterator that iterates over all the values of
+        the key, then waits for values to be added to the key and iterates
+        over them as well.
+
+        The iterator never stops by itself.
+        """
+        key = self._alter_key(key)
+
+        queue: "asyncio.Queue[_V]" = asyncio.Queue()
+
+        for value in self.get_iter(key):
+            queue.put_nowait(value)
+
+        self._watch(key, queue.put_nowait)
+
+        try:
+            while True:
+                yield await queue.get()
+
+        finally:
+            self._unwatch(key, queue.put_nowait)
+
+    def copy(self) -> "AsyncMagicDict[_K, _V]":
+        return self.__class__(self)
+
+    @classmethod
+    @typing.overload
+    def fromkeys(cls, keys: Iterable[_K]) -> "AsyncMagicDict[_K, None]":
+        ...
+
+    @classmethod
+    @typing.overload
+    def fromkeys(
+        cls, keys: Iterable[_K], value: _V
+    ) -> "AsyncMagicDict[_K, _V]":
+        ...
+
+    @classmethod
+    def fromkeys(  # type: ignore
+        cls, keys: Iterable[_K], value: Optional[_V] = None
+    ) -> Union["AsyncMagicDict[_K, None]", "AsyncMagicDict[_K, _V]"]:
+        def _gen() -> Iterator[Tuple[_K, Optional[_V]]]:
+            for k in keys:
+                yield (k, value)
+
+        return cls(_gen())  # type: ignore
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#   Copyright 2021 Kaede Hoshikawa
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+from typing import Generic, Iterable, Iterator, Optional, Tuple, TypeVar, Union
+import typing
+
+from ._dict import MagicDict
+from ._frozen_compact_dict import _CompactStorageMixin
+
+__all__ = ["CompactMagicDict"]
+
+_K = TypeVar("_K")
+
+_V = TypeVar("_V")
+
+
+class CompactMagicDict(
+    MagicDict[_K, _V],
+    _CompactStorageMixin[_K, _V],
+    Generic[_K, _V],
+):
+    """
+    `CompactMagicDict` has exactly the same functionality as
+    `MagicDict`. However, it uses much less memory per pair, which
+    matters for dictionaries with millions of pairs.
+    """
+
+    __slots__ = ("_keys", "_values")
+
+    def copy(self) -> "CompactMagicDict[_K, _V]":
+        return self.__class__(self)
+
+    @classmethod
+    @typing.overload
+    def fromkeys(cls, keys: Iterable[_K]) -> "CompactMagicDict[_K, None]":
+        ...
+
+    @classmethod
+    @typing.overload
+    def fromkeys(
+        cls, keys: Iterable[_K], value: _V
+    ) -> "CompactMagicDict[_K, _V]":
+        ...
+
+    @classmethod
+    def fromkeys(  # type: ignore
+        cls, keys: Iterable[_K], value: Optional[_V] = None
+    ) -> Union["CompactMagicDict[_K, None]", "CompactMagicDict[_K, _V]"]:
+        def _gen() -> Iterator[Tuple[_K, Optional[_V]]]:
+            for k in keys:
+                yield (k, value)
+
+        return cls(_gen())  # type: ignore
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#   Copyright 2021 Kaede Hoshikawa
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+from typing import Any
+import enum
+import threading
+
+__all__ = ["Concurrency"]
+
+
+class Concurrency(enum.Enum):
+    """
+    How a `MagicDict` guards itself against concurrent access.
+
+    The mode is selected with the `concurrency` class attribute of a
+    `MagicDict` subclass.
+    """
+
+    # No locking at all, for dictionaries used by one thread only.
+    NONE = "none"
+
+    # Modifications and lookups are serialised with a lock, iteration and
+    # membership tests of keys take no lock.
+    LOCK = "lock"
+
+    # Modifications take an exclusive lock, lookups take a shared one and
+    # iterators work on a copy made under the shared lock.
+    READ_WRITE = "read_write"
+
+    # Modifications and lookups are serialised with a lock, iterators work
+    # on a copy-on-write snapshot of the storage and never block
+    # modifications.
+    SNAPSHOT = "snapshot"
+
+
+class _ReadWriteLock:
+    """
+    A lock that is held exclusively with `with lock:` and can be shared by
+    readers with `acquire_shared` and `release_shared`.
+
+    Writers are preferred, readers wait while a writer is waiting. Shared
+    acquisitions must not be nested.
+    """
+
+    __slots__ = ("_mutex", "_cond", "_readers", "_writers", "_waiting")
+
+    def __init__(self) -> None:
+        self._mutex = threading.Lock()
+        self._cond = threading.Condition(self._mutex)
+
+        self._readers = 0
+        # Writers that are waiting for or holding the lock.
+        self._writers = 0
+        # Readers waiting for the writers to finish.
+        self._waiting = 0
+
+    def acquire_shared(self) -> None:
+        mutex = self._mutex
+        mutex.acquire()
+
+        try:
+            while self._writers:
+                self._waiting += 1
+                self._cond.wait()
+                self._waiting -= 1
+
+            self._readers += 1
+
+        finally:
+            mutex.release()
+
+    def release_shared(self) -> None:
+        mutex = self._mutex
+        mutex.acquire()
+
+        try:
+            self._readers -= 1
+
+            if not self._readers and self._writers:
+                self._cond.notify_all()
+
+        finally:
+            mutex.release()
+
+    def __enter__(self) -> None:
+        # The mutex is held until the write is done, which keeps other
+        # writers and new readers out.
+        self._mutex.acquire()
+        self._writers += 1
+
+        while self._readers:
+            self._cond.wait()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._writers -= 1
+
+        if not self._writers and self._waiting:
+            self._cond.notify_all()
+
+        self._mutex.release()
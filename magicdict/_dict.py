@@ -17,20 +17,22 @@
 
 from typing import (
     Any,
+    Callable,
     Generic,
     Iterable,
     Iterator,
     MutableMapping,
     Optional,
+    Sequence,
     Tuple,
     TypeVar,
     Union,
 )
 import collections
-import collections.abc
 import threading
 import typing
 
+from ._concurrency import Concurrency, _ReadWriteLock
 from ._frozen_dict import FrozenMagicDict
 
 __all__ = ["MagicDict"]
@@ -41,6 +43,14 @@ _V = TypeVar("_V")
 
 _T = TypeVar("_T")
 
+_D = TypeVar("_D", bound="MagicDict[Any, Any]")
+
+_F = Callable[..., Any]
+
+# Lists of indexes longer than this are turned into deques when
+# `popitem(last=False)` removes from their fronts.
+_DEQUE_THRESHOLD = 64
+
 
 class _Identifier:
     pass
@@ -49,63 +59,394 @@ class _Identifier:
 _DEFAULT_MARK = _Identifier()
 
 
+# A subclass that overrides a guarded method calls the version of its
+# parent, which is dispatched on the concurrency mode of the dictionary if
+# the parent has another mode, see `_dispatched`.
+
+
+def _exclusive(method: _F) -> _F:
+    def _guarded(self: "MagicDict[Any, Any]", *args: Any) -> Any:
+        lock = self._lock
+
+        if lock is None:
+            return method(self, *args)
+
+        with lock:
+            return method(self, *args)
+
+    return _guarded
+
+
+def _shared(method: _F) -> _F:
+    def _guarded(self: "MagicDict[Any, Any]", *args: Any) -> Any:
+        lock = self._lock
+
+        if lock is None:
+            return method(self, *args)
+
+        lock.acquire_shared()
+
+        try:
+            return method(self, *args)
+
+        finally:
+            lock.release_shared()
+
+    return _guarded
+
+
+def _exclusive_copy(method: _F) -> _F:
+    def _guarded(self: "MagicDict[Any, Any]", *args: Any) -> Any:
+        lock = self._lock
+
+        if lock is None:
+            return method(self, *args)
+
+        with lock:
+            return iter(list(method(self, *args)))
+
+    return _guarded
+
+
+def _shared_copy(method: _F) -> _F:
+    def _guarded(self: "MagicDict[Any, Any]", *args: Any) -> Any:
+        lock = self._lock
+
+        if lock is None:
+            return method(self, *args)
+
+        lock.acquire_shared()
+
+        try:
+            return iter(list(method(self, *args)))
+
+        finally:
+            lock.release_shared()
+
+    return _guarded
+
+
+def _listed_keys(guard: Callable[[_F], _F]) -> Callable[[_F], _F]:
+    """
+    Apply the guard to a batch lookup, after the keys are consumed.
+    """
+
+    def _guard(method: _F) -> _F:
+        guarded = guard(method)
+
+        def _guarded(
+            self: "MagicDict[Any, Any]", keys: Any, *args: Any
+        ) -> Any:
+            # Iterators may run arbitrary code (or read from this dictionary),
+            # they are consumed before taking the lock.
+            if self._lock is not None and not isinstance(keys, list):
+                keys = list(keys)
+
+            return guarded(self, keys, *args)
+
+        return _guarded
+
+    return _guard
+
+
+class _Snapshot:
+    """
+    The storage handed over by `_share_storage`, it can be read by the
+    unguarded methods in place of the dictionary.
+    """
+
+    def __init__(self, fields: Tuple[str, ...], storage: Tuple[Any, ...]):
+        for name, value in zip(fields, storage):
+            setattr(self, name, value)
+
+
+def _snapshot(method: _F) -> _F:
+    def _guarded(self: "MagicDict[Any, Any]") -> Any:
+        # Sharing the storage makes the dictionary copy it before the next
+        # modification, so the snapshot never changes.
+        return method(_Snapshot(self._storage_fields, self._share_storage()))
+
+    return _guarded
+
+
+# How each method inherited from `FrozenMagicDict` is guarded in each
+# concurrency mode, methods without a guard are inherited as is.
+_GUARDS: typing.Dict[Concurrency, typing.Dict[str, _F]] = {
+    Concurrency.NONE: {},
+    Concurrency.LOCK: {
+        "_add_one": _exclusive,
+        "_share_storage": _exclusive,
+        "_derive": _exclusive,
+        "compact": _exclusive,
+        "__getitem__": _exclusive,
+        "get_last": _exclusive,
+        "_has_pair": _exclusive,
+        "_columns": _exclusive,
+        "get_many": _listed_keys(_exclusive),
+        "get_last_many": _listed_keys(_exclusive),
+        "get_list_many": _listed_keys(_exclusive),
+        "_has_value": _exclusive,
+        "__eq__": _exclusive,
+        "get_iter": _exclusive_copy,
+    },
+    Concurrency.READ_WRITE: {
+        "_add_one": _exclusive,
+        "_share_storage": _exclusive,
+        "_derive": _exclusive,
+        "compact": _exclusive,
+        "__getitem__": _shared,
+        "get_last": _shared,
+        "_has_pair": _shared,
+        "_columns": _shared,
+        "get_many": _listed_keys(_shared),
+        "get_last_many": _listed_keys(_shared),
+        "get_list_many": _listed_keys(_shared),
+        "count": _shared,
+        "key_count": _shared,
+        "get_iter": _shared_copy,
+        "_iter_pairs": _shared_copy,
+        "_reversed_pairs": _shared_copy,
+    },
+    Concurrency.SNAPSHOT: {
+        "_add_one": _exclusive,
+        "_share_storage": _exclusive,
+        "_derive": _exclusive,
+        "compact": _exclusive,
+        "__getitem__": _exclusive,
+        "get_last": _exclusive,
+        "_has_pair": _exclusive,
+        "get_many": _listed_keys(_exclusive),
+        "get_last_many": _listed_keys(_exclusive),
+        "get_list_many": _listed_keys(_exclusive),
+        "count": _exclusive,
+        "key_count": _exclusive,
+        "_columns": _snapshot,
+        "get_iter": _exclusive_copy,
+        "_iter_pairs": _snapshot,
+        "_reversed_pairs": _snapshot,
+    },
+}
+
+_GUARDED_NAMES = frozenset(
+    name for guards in _GUARDS.values() for name in guards
+)
+
+
+def _is_override(method: _F, unguarded: _F) -> bool:
+    """
+    Return `True` if the method is not one set by `_guard_methods`.
+    """
+    return not getattr(method, "_guarded", method is unguarded)
+
+
+def _dispatched(
+    name: str, method: _F, concurrency: Concurrency, unguarded: _F
+) -> _F:
+    """
+    Return a version of a method guarded for a concurrency mode that is
+    guarded as the mode of the dictionary requires.
+
+    It replaces the method of a parent class once a subclass with another
+    mode overrides it, as the override calls the method of the parent.
+    """
+    methods = {}
+
+    for mode, guards in _GUARDS.items():
+        guard = guards.get(name)
+        methods[mode] = unguarded if guard is None else guard(unguarded)
+
+    # Instrumented classes keep their instrumented method.
+    methods[concurrency] = method
+
+    def _guarded(self: "MagicDict[Any, Any]", *args: Any) -> Any:
+        return methods[self.concurrency](self, *args)
+
+    _guarded._guarded = True  # type: ignore
+    _guarded._dispatched = True  # type: ignore
+
+    return _guarded
+
+
 class MagicDict(
     FrozenMagicDict[_K, _V], MutableMapping[_K, _V], Generic[_K, _V]
 ):
     """
     A mutable version of `FrozenMagicDict`.
+
+    How it guards itself against concurrent access is selected with the
+    `concurrency` class attribute of a subclass, see `Concurrency`.
     """
 
-    __slots__ = ("_lock",)
+    __slots__ = ("_lock", "_head")
 
-    def __init__(self, *args: Any, **kwargs: Any) -> None:
-        self._lock = threading.Lock()
+    concurrency = Concurrency.LOCK
 
-        super().__init__(*args, **kwargs)
+    # Mutable, so not hashable.
+    __hash__ = None  # type: ignore
 
-    def _add_one(self, key: _K, value: _V) -> None:
-        with self._lock:
-            super()._add_one(key, value)
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        # Guarded before `FrozenMagicDict` instruments the guarded methods.
+        cls._guard_methods()
 
-    def _has_value(self, value: Any) -> bool:
-        with self._lock:
-            return super()._has_value(value)
+        super().__init_subclass__(**kwargs)
 
-    def __eq__(self, obj: Any) -> bool:
-        with self._lock:
-            return super().__eq__(obj)
+    @classmethod
+    def _guard_methods(cls) -> None:
+        """
+        Replace the methods that read or modify the storage with versions
+        guarded as the concurrency mode requires.
 
-    def __setitem__(self, key: _K, value: _V) -> None:
-        key = self._alter_key(key)
+        Only the modes that need it pay for a guard, the lookups of a
+        dictionary without locking are the ones of `FrozenMagicDict`.
+        """
+        cls.concurrency = Concurrency(cls.concurrency)
+        guards = _GUARDS[cls.concurrency]
+
+        unguarded = super(MagicDict, cls)
+
+        mro = cls.__mro__
+        subclasses = mro[: mro.index(MagicDict)]
+
+        for name in _GUARDED_NAMES:
+            method = getattr(unguarded, name)
+
+            overriding = [
+                klass
+                for klass in subclasses
+                if name in klass.__dict__
+                and _is_override(klass.__dict__[name], method)
+            ]
+
+            if overriding:
+                # Overridden by a subclass, which calls the version of the
+                # first parent that does not override it.
+                parent: Any = next(
+                    klass
+                    for klass in mro[mro.index(overriding[0]) + 1 :]
+                    if name in klass.__dict__
+                    and not _is_override(klass.__dict__[name], method)
+                )
+                parent_method = parent.__dict__[name]
 
-        with self._lock:
-            index = self._get_next_index()
+                if parent.concurrency is not cls.concurrency and not getattr(
+                    parent_method, "_dispatched", False
+                ):
+                    setattr(
+                        parent,
+                        name,
+                        _dispatched(
+                            name,
+                            parent_method,
+                            parent.concurrency,
+                            getattr(super(MagicDict, parent), name),
+                        ),
+                    )
 
-            self._first_values[key] = value
+                continue
 
-            previous_indexes, self._pair_ids[key] = (
-                self._pair_ids.get(key, []),
-                [index],
-            )
+            guard = guards.get(name)
 
-            for index in previous_indexes:
-                del self._kv_pairs[index]
+            if guard is not None:
+                method = guard(method)
+                method._guarded = True
 
-            self._kv_pairs[index] = (key, value)
+            setattr(cls, name, method)
 
-            self._last_values[key] = value
+    def _init_instance(self) -> None:
+        self._lock: Any = self._make_lock()
 
-    def __delitem__(self, key: _K) -> None:
+        super()._init_instance()
+
+    def _make_lock(self) -> Any:
+        concurrency = self.concurrency
+
+        if concurrency is Concurrency.NONE:
+            return None
+
+        elif concurrency is Concurrency.READ_WRITE:
+            return _ReadWriteLock()
+
+        else:
+            return threading.Lock()
+
+    def _init_storage(self) -> None:
+        super()._init_storage()
+
+        # Lookups do not take the lock in every concurrency mode, the pairs
+        # are indexed from the start so they never index them concurrently.
+        self._pair_ids = {}
+
+        # All slots before `_head` are known to be removed.
+        self._head = 0
+
+    def _add_pairs(
+        self, pairs: Iterable[Tuple[Any, Any]], keys_altered: bool = False
+    ) -> None:
+        lock = self._lock
+
+        if lock is None:
+            super()._add_pairs(pairs, keys_altered)
+
+            return
+
+        # Consume iterators and views before taking the lock as they may run
+        # arbitrary code (or read from this dictionary).
+        if not isinstance(pairs, list):
+            pairs = list(pairs)
+
+        with lock:
+            super()._add_pairs(pairs, keys_altered)
+
+    def _add_storage(self, storage: Tuple[Any, ...]) -> None:
+        lock = self._lock
+
+        if lock is None:
+            super()._add_storage(storage)
+
+            return
+
+        with lock:
+            if len(self):
+                # Filled by another thread in the meantime.
+                iter_pairs = super(MagicDict, type(self))._iter_pairs
+                snapshot = _Snapshot(self._storage_fields, storage)
+                super()._add_pairs(iter_pairs(snapshot), True)  # type: ignore
+
+            else:
+                super()._add_storage(storage)
+
+    def _compact(self) -> None:
+        super()._compact()
+
+        self._head = 0
+
+    def _remove_indexes(self, indexes: Sequence[int]) -> None:
+        super()._remove_indexes(indexes)
+
+        if not len(self):
+            self._head = 0
+
+    def __setitem__(self, key: _K, value: _V) -> None:
         key = self._alter_key(key)
+        lock = self._lock
+
+        if lock is None:
+            self._set_one(key, value)
 
-        with self._lock:
-            del self._first_values[key]
+        else:
+            with lock:
+                self._set_one(key, value)
 
-            indexes = self._pair_ids.pop(key)
-            for index in indexes:
-                del self._kv_pairs[index]
+    def __delitem__(self, key: _K) -> None:
+        key = self._alter_key(key)
+        lock = self._lock
 
-            del self._last_values[key]
+        if lock is None:
+            self._remove_key(key)
+
+        else:
+            with lock:
+                self._remove_key(key)
 
     def add(self, key: _K, value: _V) -> None:
         """
@@ -113,29 +454,33 @@ class MagicDict(
         """
         self._add_one(key, value)
 
-    def pop(
-        self, key: _K, default: Union[_V, _T, _Identifier] = _DEFAULT_MARK
-    ) -> Union[_V, _T]:
-        key = self._alter_key(key)
+    def _pop_one(self, key: _K) -> _V:
+        if self._shared and key in self._pair_ids:
+            self._unshare()
 
-        try:
-            with self._lock:
-                index = self._pair_ids[key].pop()
+        indexes = self._pair_ids[key]
+        index = indexes.pop()
 
-                if len(self._pair_ids[key]) == 0:
-                    del self._first_values[key]
+        if not indexes:
+            del self._pair_ids[key]
 
-                    del self._pair_ids[key]
+        _, value = self._pair_at(index)  # type: ignore
+        self._remove_indexes((index,))
 
-                    del self._last_values[key]
+        return value
 
-                else:
-                    new_last_index = self._pair_ids[key][-1]
-                    self._last_values[key] = self._kv_pairs[new_last_index][1]
+    def pop(
+        self, key: _K, default: Union[_V, _T, _Identifier] = _DEFAULT_MARK
+    ) -> Union[_V, _T]:
+        key = self._alter_key(key)
+        lock = self._lock
 
-                _, value = self._kv_pairs.pop(index)
+        try:
+            if lock is None:
+                return self._pop_one(key)
 
-                return value
+            with lock:
+                return self._pop_one(key)
 
         except KeyError as e:
             if default is _DEFAULT_MARK:
@@ -144,65 +489,76 @@ class MagicDict(
             else:
                 return default  # type: ignore
 
-    def popitem(self, last: bool = True) -> Tuple[_K, _V]:
-        with self._lock:
-            index, pair = self._kv_pairs.popitem(last)
+    def _pop_pair(self, last: bool) -> Tuple[_K, _V]:
+        if self._shared:
+            self._unshare()
 
-            key, _ = pair
+        if not len(self):
+            raise KeyError("popitem(): dictionary is empty")
 
-            if len(self._pair_ids[key]) == 1:
-                del self._first_values[key]
+        if last:
+            # Trailing tombstones are always trimmed.
+            index = len(self) + self._tombstones - 1
 
-                del self._pair_ids[key]
+        else:
+            index = self._head
+            pair_at = self._pair_at
 
-                del self._last_values[key]
+            while pair_at(index) is None:
+                index += 1
 
-            elif self._pair_ids[key][-1] == index:
-                next_last_index = self._pair_ids[key][-2]
+            self._head = index + 1
 
-                self._last_values[key] = self._kv_pairs[next_last_index][1]
+        pair: Tuple[_K, _V] = self._pair_at(index)  # type: ignore
+        key, _ = pair
 
-                self._pair_ids[key].remove(index)
+        indexes = self._pair_ids[key]
 
-            return pair
+        if last:
+            # The last pair of the dictionary is the last one of its key.
+            indexes.pop()
 
-    def update(self, *args: Any, **kwargs: Any) -> None:  # Type Hints???
-        if args:
-            if len(args) > 1:  # pragma: no cover
-                raise TypeError(
-                    (
-                        "update expected at most 1 positional argument, "
-                        "got {} args."
-                    ).format(len(args))
-                )
+        elif isinstance(indexes, collections.deque):
+            indexes.popleft()
 
-            elif isinstance(args[0], collections.abc.Mapping):
-                for k, v in args[0].items():
-                    self.add(k, v)
+        elif len(indexes) > _DEQUE_THRESHOLD and isinstance(indexes, list):
+            # The first pair of the dictionary is the first one of its key.
+            # Removing from the front of a list moves all the indexes after
+            # it.
+            indexes = self._pair_ids[key] = collections.deque(indexes)
+            indexes.popleft()
 
-            elif isinstance(args[0], collections.abc.Iterable):  # noqa: SIM106
-                for k, v in args[0]:
-                    self.add(k, v)
+        else:
+            del indexes[0]
 
-            else:  # pragma: no cover
-                raise TypeError(
-                    (
-                        "update expected a Mapping or an Iterable "
-                        "as the positional argument, got {}."
-                    ).format(type(args[0]))
-                )
+        if not indexes:
+            del self._pair_ids[key]
 
-        for k, v in kwargs.items():
-            self.add(k, v)
+        self._remove_indexes((index,))
+
+        return pair
+
+    def popitem(self, last: bool = True) -> Tuple[_K, _V]:
+        lock = self._lock
+
+        if lock is None:
+            return self._pop_pair(last)
+
+        with lock:
+            return self._pop_pair(last)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:  # Type Hints???
+        self._update(args, kwargs)
 
     def clear(self) -> None:
-        with self._lock:
-            self._first_values.clear()
+        lock = self._lock
 
-            self._kv_pairs.clear()
-            self._pair_ids.clear()
+        if lock is None:
+            self._init_storage()
 
-            self._last_values.clear()
+        else:
+            with lock:
+                self._init_storage()
 
     @typing.overload  # type: ignore
     def setdefault(
@@ -246,4 +602,7 @@ class MagicDict(
             for k in keys:
                 yield (k, value)
 
-        return cls(_gen())
+        return cls(_gen())  # type: ignore
+
+
+MagicDict._guard_methods()
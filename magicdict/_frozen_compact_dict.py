@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#   Copyright 2021 Kaede Hoshikawa
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+import array
+import itertools
+import operator
+import typing
+
+from ._frozen_dict import FrozenMagicDict
+
+__all__ = ["FrozenCompactMagicDict"]
+
+_K = TypeVar("_K")
+
+_V = TypeVar("_V")
+
+_T = TypeVar("_T")
+
+_D = TypeVar("_D", bound="_CompactStorageMixin[Any, Any]")
+
+
+class _Removed:
+    pass
+
+
+# Marks the key slot of a removed pair, `None` is a valid key.
+_REMOVED: Any = _Removed()
+
+
+def _new_indexes(index: int) -> "array.array[int]":
+    return array.array("q", (index,))
+
+
+class _CompactStorageMixin(FrozenMagicDict[_K, _V], Generic[_K, _V]):
+    """
+    Stores the keys and the values in two parallel lists instead of a list
+    of pairs, and the indexes of each key in an `array` of 64-bit integers.
+    No tuple or int object is kept per pair.
+
+    Subclasses need to provide the `_keys` and `_values` slots.
+    """
+
+    __slots__ = ()
+
+    _storage_fields = ("_keys", "_values", "_pair_ids", "_tombstones")
+
+    _keys: List[_K]
+    _values: List[_V]
+
+    def _init_storage(self) -> None:
+        # Removed pairs are marked with `_REMOVED` in `_keys` until the lists
+        # are compacted.
+        self._keys = []
+        self._values = []
+        self._pair_ids: Dict[_K, "array.array[int]"] = {}  # type: ignore
+
+        self._tombstones = 0
+        self._compactions = 0
+
+        self._shared = False
+
+    def _unshare(self) -> None:
+        if self._tombstones:
+            self._compact()
+
+        else:
+            self._keys = self._keys.copy()
+            self._values = self._values.copy()
+            self._pair_ids = {
+                key: indexes[:] for key, indexes in self._pair_ids.items()
+            }
+
+        self._shared = False
+
+    def _derive(self: _D, key: Any) -> _D:
+        dic = self.__class__()
+
+        for name in self._storage_fields:
+            setattr(dic, name, getattr(self, name))
+
+        self._shared = True
+
+        dic._keys = self._keys.copy()
+        dic._values = self._values.copy()
+        dic._pair_ids = self._pair_ids.copy()
+
+        indexes = dic._pair_ids.get(key)
+
+        if indexes is not None:
+            dic._pair_ids[key] = indexes[:]
+
+        return dic
+
+    def _add_one(self, key: _K, value: _V) -> None:
+        self._append_pair(self._alter_key(key), value)
+
+    def _append_pair(self, key: _K, value: _V) -> None:
+        if self._shared:
+            self._unshare()
+
+        keys = self._keys
+        indexes = self._pair_ids.get(key)
+
+        if indexes is None:
+            self._pair_ids[key] = _new_indexes(len(keys))
+
+        else:
+            indexes.append(len(keys))
+
+        keys.append(key)
+        self._values.append(value)
+
+    def _add_pairs(
+        self, pairs: Iterable[Tuple[Any, Any]], keys_altered: bool = False
+    ) -> None:
+        if self._shared:
+            self._unshare()
+
+        keys = self._keys
+        pair_ids = self._pair_ids
+
+        append_key = keys.append
+        append_value = self._values.append
+        get_indexes = pair_ids.get
+
+        alter_key = None if keys_altered else self._alter_key
+        index = len(keys)
+
+        for key, value in pairs:
+            if alter_key is not None:
+                key = alter_key(key)
+
+            indexes = get_indexes(key)
+
+            if indexes is None:
+                pair_ids[key] = _new_indexes(index)
+
+            else:
+                indexes.append(index)
+
+            append_key(key)
+            append_value(value)
+            index += 1
+
+    def _remove_indexes(self, indexes: Sequence[int]) -> None:
+        keys = self._keys
+        values = self._values
+
+        for index in indexes:
+            keys[index] = _REMOVED
+            # Release the value.
+            values[index] = None  # type: ignore
+            self._tombstones += 1
+
+        while keys and keys[-1] is _REMOVED:
+            keys.pop()
+            values.pop()
+            self._tombstones -= 1
+
+        if self._tombstones > len(keys) * self.compaction_threshold:
+            self._compact()
+
+    def _compact(self) -> None:
+        live = list(
+            map(operator.is_not, self._keys, itertools.repeat(_REMOVED))
+        )
+        keys = list(itertools.compress(self._keys, live))
+        values = list(itertools.compress(self._values, live))
+        pair_ids: Dict[_K, "array.array[int]"] = {}
+
+        for index, key in enumerate(keys):
+            indexes = pair_ids.get(key)
+
+            if indexes is None:
+                pair_ids[key] = _new_indexes(index)
+
+            else:
+                indexes.append(index)
+
+        self._keys = keys
+        self._values = values
+        self._pair_ids = pair_ids
+
+        self._tombstones = 0
+        self._compactions += 1
+
+    def _columns(self) -> Tuple[List[_K], List[_V]]:
+        keys = self._keys
+        values = self._values
+
+        if not self._tombstones:
+            return (keys.copy(), values.copy())
+
+        live = list(map(operator.is_not, keys, itertools.repeat(_REMOVED)))
+
+        return (
+            list(itertools.compress(keys, live)),
+            list(itertools.compress(values, live)),
+        )
+
+    def _add_columns(self, keys: Sequence[_K], values: Sequence[_V]) -> None:
+        if len(self):
+            super()._add_columns(keys, values)
+
+            return
+
+        # Take the lists over and only build the index.
+        self._keys = list(keys)
+        self._values = list(values)
+        self._tombstones = 0
+        self._shared = False
+
+        keys = self._keys
+
+        if len(set(keys)) == len(keys):
+            # Keys are often distinct, the index can then be built in C.
+            self._pair_ids = dict(
+                zip(
+                    keys,
+                    map(
+                        array.array,
+                        itertools.repeat("q"),
+                        zip(range(len(keys))),
+                    ),
+                )
+            )
+
+            return
+
+        pair_ids: Dict[_K, "array.array[int]"] = {}
+        self._pair_ids = pair_ids
+
+        for index, key in enumerate(keys):
+            indexes = pair_ids.get(key)
+
+            if indexes is None:
+                pair_ids[key] = _new_indexes(index)
+
+            else:
+                indexes.append(index)
+
+    def _pair_at(self, index: int) -> Optional[Tuple[_K, _V]]:
+        key = self._keys[index]
+
+        if key is _REMOVED:
+            return None
+
+        return (key, self._values[index])
+
+    def _iter_pairs(self) -> Iterator[Tuple[_K, _V]]:
+        keys = self._keys
+        pairs = zip(keys, self._values)
+
+        if not self._tombstones:
+            return pairs
+
+        return itertools.compress(
+            pairs, map(operator.is_not, keys, itertools.repeat(_REMOVED))
+        )
+
+    def _reversed_pairs(self) -> Iterator[Tuple[_K, _V]]:
+        keys = self._keys
+        pairs = zip(reversed(keys), reversed(self._values))
+
+        if not self._tombstones:
+            return pairs
+
+        return itertools.compress(
+            pairs,
+            map(operator.is_not, reversed(keys), itertools.repeat(_REMOVED)),
+        )
+
+    def _has_pair(self, key: Any, value: Any) -> bool:
+        try:
+            indexes = self._pair_ids.get(key)
+
+        except TypeError:  # unhashable key.
+            return False
+
+        if indexes is None:
+            return False
+
+        return value in map(self._values.__getitem__, indexes)
+
+    def _has_value(self, value: Any) -> bool:
+        values: Iterable[Any] = self._values
+
+        if self._tombstones:
+            values = itertools.compress(
+                values,
+                map(operator.is_not, self._keys, itertools.repeat(_REMOVED)),
+            )
+
+        return value in values
+
+    def __getitem__(self, key: _K) -> _V:
+        key = self._alter_key(key)
+
+        return self._values[self._pair_ids[key][0]]
+
+    def __len__(self) -> int:
+        return len(self._keys) - self._tombstones
+
+    @typing.overload
+    def get_last(self, key: _K) -> Optional[_V]:
+        ...
+
+    @typing.overload
+    def get_last(self, key: _K, default: _T = ...) -> Union[_V, _T]:
+        ...
+
+    def get_last(
+        self, key: _K, default: Optional[_T] = None
+    ) -> Optional[Union[_V, _T]]:
+        key = self._alter_key(key)
+
+        try:
+            return self._values[self._pair_ids[key][-1]]
+
+        except KeyError:
+            return default
+
+    def get_iter(self, key: _K) -> Iterator[_V]:
+        key = self._alter_key(key)
+
+        keys = self._keys
+        values = self._values
+
+        for index in self._pair_ids.get(key, ()):
+            if keys[index] is _REMOVED:  # pragma: no cover
+                raise RuntimeError("Dictionary modified during iteration.")
+
+            yield values[index]
+
+    @typing.overload
+    def get_many(self, keys: Iterable[_K]) -> List[Optional[_V]]:
+        ...
+
+    @typing.overload
+    def get_many(
+        self, keys: Iterable[_K], default: _T = ...
+    ) -> List[Union[_V, _T]]:
+        ...
+
+    def get_many(
+        self, keys: Iterable[_K], default: Optional[_T] = None
+    ) -> List[Any]:
+        values = self._values
+
+        return [
+            default if indexes is None else values[indexes[0]]
+            for indexes in map(self._pair_ids.get, self._alter_keys(keys))
+        ]
+
+    @typing.overload
+    def get_last_many(self, keys: Iterable[_K]) -> List[Optional[_V]]:
+        ...
+
+    @typing.overload
+    def get_last_many(
+        self, keys: Iterable[_K], default: _T = ...
+    ) -> List[Union[_V, _T]]:
+        ...
+
+    def get_last_many(
+        self, keys: Iterable[_K], default: Optional[_T] = None
+    ) -> List[Any]:
+        values = self._values
+
+        return [
+            default if indexes is None else values[indexes[-1]]
+            for indexes in map(self._pair_ids.get, self._alter_keys(keys))
+        ]
+
+    def get_list_many(self, keys: Iterable[_K]) -> List[List[_V]]:
+        values = self._values
+        get_indexes = self._pair_ids.get
+
+        return [
+            list(map(values.__getitem__, get_indexes(key, ())))
+            for key in self._alter_keys(keys)
+        ]
+
+
+class FrozenCompactMagicDict(_CompactStorageMixin[_K, _V], Generic[_K, _V]):
+    """
+    `FrozenCompactMagicDict` has exactly the same functionality as
+    `FrozenMagicDict`. However, it uses much less memory per pair, which
+    matters for dictionaries with millions of pairs.
+    """
+
+    __slots__ = ("_keys", "_values")
+
+    def copy(self) -> "FrozenCompactMagicDict[_K, _V]":
+        return self.__class__(self)
+
+    @classmethod
+    @typing.overload
+    def fromkeys(
+        cls, keys: Iterable[_K]
+    ) -> "FrozenCompactMagicDict[_K, None]":
+        ...
+
+    @classmethod
+    @typing.overload
+    def fromkeys(
+        cls, keys: Iterable[_K], value: _V
+    ) -> "FrozenCompactMagicDict[_K, _V]":
+        ...
+
+    @classmethod
+    def fromkeys(  # type: ignore
+        cls, keys: Iterable[_K], value: Optional[_V] = None
+    ) -> Union[
+        "FrozenCompactMagicDict[_K, None]",
+        "FrozenCompactMagicDict[_K, _V]",
+    ]:
+        def _gen() -> Iterator[Tuple[_K, Optional[_V]]]:
+            for k in keys:
+                yield (k, value)
+
+        return cls(_gen())  # type: ignore
@@ -17,27 +17,35 @@
 
 from typing import (
     Any,
+    Callable,
+    Deque,
     Dict,
     Generic,
     Iterable,
     Iterator,
+    KeysView,
     List,
     Mapping,
+    NamedTuple,
     Optional,
     Reversible,
+    Sequence,
     Tuple,
     TypeVar,
     Union,
 )
 import collections
 import collections.abc
+import itertools
+import operator
 import typing
 
+from ._instrumentation import _instrument
 from ._items_view import MagicItemsView
-from ._keys_view import MagicKeysView
+from ._keys_view import MagicKeysView, _UniqueKeysView
 from ._values_view import MagicValuesView
 
-__all__ = ["FrozenMagicDict"]
+__all__ = ["FrozenMagicDict", "StorageStats"]
 
 _K = TypeVar("_K")
 
@@ -45,6 +53,75 @@ _V = TypeVar("_V")
 
 _T = TypeVar("_T")
 
+_D = TypeVar("_D", bound="FrozenMagicDict[Any, Any]")
+
+# The indexes of a key are kept in a list, `MagicDict` turns long lists
+# into deques when it removes from their fronts.
+_Indexes = Union[List[int], Deque[int]]
+
+
+def _index_pairs(pairs: Iterable[Optional[Tuple[Any, Any]]]) -> Dict[Any, Any]:
+    """
+    Return the indexes of the pairs of each key, skipping removed pairs.
+    """
+    pair_ids: Dict[Any, _Indexes] = {}
+
+    for index, pair in enumerate(pairs):
+        if pair is None:
+            continue
+
+        indexes = pair_ids.get(pair[0])
+
+        if indexes is None:
+            pair_ids[pair[0]] = [index]
+
+        else:
+            indexes.append(index)
+
+    return pair_ids
+
+
+def _rebuild(
+    cls: "typing.Type[_D]",
+    keys: Sequence[Any],
+    values: Sequence[Any],
+    state: Optional[Dict[str, Any]] = None,
+) -> _D:
+    """
+    Rebuild a pickled dictionary, the keys have already been altered.
+
+    Like the rest of pickling, this does not call `__init__`, which a
+    subclass may have changed.
+    """
+    dic = cls.__new__(cls)
+    dic._init_instance()
+    dic._add_columns(keys, values)
+
+    if state:
+        # The attributes of a subclass without `__slots__`.
+        dic.__dict__.update(state)
+
+    return dic
+
+
+class StorageStats(NamedTuple):
+    """
+    The usage of the storage of a dictionary, see
+    `FrozenMagicDict.storage_stats`.
+    """
+
+    # Pairs in the dictionary.
+    pairs: int
+    # Slots in the storage, including the ones of removed pairs.
+    slots: int
+    # Slots of removed pairs that are yet to be compacted.
+    removed: int
+    # Distinct keys.
+    keys: int
+    # Times the storage has been compacted since the dictionary was created
+    # or cleared.
+    compactions: int
+
 
 class FrozenMagicDict(Reversible[_K], Mapping[_K, _V], Generic[_K, _V]):
     """
@@ -52,13 +129,46 @@ class FrozenMagicDict(Reversible[_K], Mapping[_K, _V], Generic[_K, _V]):
     """
 
     __slots__ = (
-        "_next_index",
-        "_first_values",
-        "_pair_ids",
-        "_kv_pairs",
-        "_last_values",
+        "_pairs",
+        "_key_index",
+        "_scans",
+        "_tombstones",
+        "_hash",
+        "_shared",
+        "_compactions",
     )
 
+    # The storage is compacted once the slots of removed pairs are more than
+    # this fraction of all the slots.
+    compaction_threshold = 0.5
+
+    # Frozen dictionaries with up to this many pairs are not indexed until
+    # the index is needed, their keys are looked up by scanning the pairs.
+    index_threshold = 8
+
+    # Lookups done by scanning the pairs before they are indexed anyway, so
+    # a small dictionary that is looked up many times is indexed as well.
+    scan_limit = 4
+
+    # Subclasses that set this to `True` record their operations and the
+    # time spent waiting for their lock in `instrumentation`, the classes
+    # that do not pay nothing for it.
+    instrumented = False
+
+    # Attributes that make up the storage, they are handed over as is when
+    # a dictionary is copied.
+    _storage_fields: Tuple[str, ...] = ("_pairs", "_pair_ids", "_tombstones")
+
+    # Subclasses that keep track of the stored pairs set this to a method,
+    # `_add_pairs` then calls it with each pair it adds.
+    _count_pair: Optional[Callable[[Tuple[Any, Any]], None]] = None
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+
+        if cls.instrumented:
+            _instrument(cls)
+
     @staticmethod
     def _alter_key(key: _K) -> _K:
         return key
@@ -84,17 +194,17 @@ class FrozenMagicDict(Reversible[_K], Mapping[_K, _V], Generic[_K, _V]):
         ...
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:  # noqa: F811
-        self._next_index = 0
+        self._init_instance()
 
-        self._first_values: Dict[_K, _V] = {}
-
-        self._pair_ids: Dict[_K, List[int]] = {}
-        self._kv_pairs: "collections.OrderedDict[int, Tuple[_K, _V]]" = (
-            collections.OrderedDict()
-        )
+        self._update(args, kwargs)
 
-        self._last_values: Dict[_K, _V] = {}
+    def _init_instance(self) -> None:
+        """
+        Set up an empty dictionary, for `__init__` and for unpickling.
+        """
+        self._init_storage()
 
+    def _update(self, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> None:
         if args:
             if len(args) > 1:  # pragma: no cover
                 raise TypeError(
@@ -104,68 +214,476 @@ class FrozenMagicDict(Reversible[_K], Mapping[_K, _V], Generic[_K, _V]):
                     ).format(len(args))
                 )
 
-            if isinstance(args[0], collections.abc.Mapping):
-                for k, v in args[0].items():
-                    self._add_one(k, v)
+            obj = args[0]
+
+            if type(obj) is list or type(obj) is tuple:
+                # Checking against the abstract classes below costs more than
+                # adding a handful of pairs.
+                self._add_pairs(obj)
+
+            elif type(obj) is dict:
+                self._add_pairs(obj.items())
+
+            elif (
+                isinstance(obj, FrozenMagicDict)
+                and obj._alter_key is self._alter_key
+            ):
+                # The keys have already been altered the same way.
+                if len(self) or self._storage_fields != obj._storage_fields:
+                    self._add_pairs(list(obj._iter_pairs()), True)
 
-            elif isinstance(args[0], collections.abc.Iterable):  # noqa: SIM106
-                for k, v in args[0]:
-                    self._add_one(k, v)
+                else:
+                    self._add_storage(obj._share_storage())
+
+            elif isinstance(obj, collections.abc.Mapping):
+                self._add_pairs(obj.items())
+
+            elif isinstance(obj, collections.abc.Iterable):  # noqa: SIM106
+                self._add_pairs(obj)
 
             else:  # pragma: no cover
                 raise TypeError(
                     (
                         "update expected a Mapping or an Iterable "
                         "as the positional argument, got {}."
-                    ).format(type(args[0]))
+                    ).format(type(obj))
                 )
 
-        for k, v in kwargs.items():
-            self._add_one(k, v)
+        if kwargs:
+            self._add_pairs(kwargs.items())
+
+    def _init_storage(self) -> None:
+        # All pairs live in one list in insertion order. Removed pairs are
+        # replaced with `None` (a tombstone) until the list is compacted so
+        # the indexes stored in `_pair_ids` stay valid.
+        self._pairs: List[Tuple[_K, _V]] = []
+        # The indexes of the pairs of each key, see `_pair_ids`.
+        self._key_index: Optional[Dict[_K, _Indexes]] = None
+        self._scans = self.scan_limit
+
+        self._tombstones = 0
+        self._compactions = 0
+
+        # Whether the storage may be referenced by another dictionary, it has
+        # to be copied before being modified.
+        self._shared = False
+
+    @property
+    def _pair_ids(self) -> Dict[_K, _Indexes]:
+        """
+        The indexes of the pairs of each key, the pairs of a small frozen
+        dictionary are indexed the first time they are needed.
+        """
+        pair_ids = self._key_index
+
+        if pair_ids is None:
+            pair_ids = self._key_index = _index_pairs(self._pairs)
+
+        return pair_ids
+
+    @_pair_ids.setter
+    def _pair_ids(self, pair_ids: Dict[_K, _Indexes]) -> None:
+        self._key_index = pair_ids
+
+    def _unshare(self) -> None:
+        if self._tombstones:
+            # Compacting builds new containers as well.
+            self._compact()
 
-    def _get_next_index(self) -> int:
-        next_index = self._next_index
-        self._next_index += 1
+        else:
+            self._pairs = self._pairs.copy()
+            self._pair_ids = {
+                key: indexes.copy() for key, indexes in self._pair_ids.items()
+            }
 
-        return next_index
+        self._shared = False
 
     def _add_one(self, key: _K, value: _V) -> None:
         key = self._alter_key(key)
 
-        index = self._get_next_index()
+        if self._shared:
+            self._unshare()
+
+        pairs = self._pairs
+        pair_ids = self._pair_ids
+        indexes = pair_ids.get(key)
+
+        if indexes is None:
+            pair_ids[key] = [len(pairs)]
+
+        else:
+            indexes.append(len(pairs))
+
+        pairs.append((key, value))
+
+    def _append_pair(self, key: _K, value: _V) -> None:
+        """
+        Append a pair whose key has already been altered.
+        """
+        if self._shared:
+            self._unshare()
+
+        pairs = self._pairs
+        pair_ids = self._pair_ids
+        indexes = pair_ids.get(key)
+
+        if indexes is None:
+            pair_ids[key] = [len(pairs)]
+
+        else:
+            indexes.append(len(pairs))
+
+        pairs.append((key, value))
+
+    def _add_pairs(
+        self, pairs: Iterable[Tuple[Any, Any]], keys_altered: bool = False
+    ) -> None:
+        """
+        Add pairs in bulk.
+
+        This does what calling `_add_one` for each pair does, without the
+        per pair method calls.
+        """
+        if self._shared:
+            # Copying the storage may compact it, which moves the pairs.
+            self._unshare()
+
+        count_pair = self._count_pair
+
+        if count_pair is None:
+            self._store_pairs(pairs, keys_altered)
+
+            return
+
+        start = len(self._pairs)
+
+        self._store_pairs(pairs, keys_altered)
+
+        for pair in itertools.islice(self._pairs, start, None):
+            count_pair(pair)
+
+    def _store_pairs(
+        self, pairs: Iterable[Tuple[Any, Any]], keys_altered: bool
+    ) -> None:
+        """
+        Append pairs to unshared storage and index them.
+        """
+        own_pairs = self._pairs
+
+        if self._key_index is None:
+            if (
+                len(own_pairs) + operator.length_hint(pairs)
+                <= self.index_threshold
+            ):
+                self._extend_pairs(pairs, keys_altered)
+
+                return
+
+            self._key_index = _index_pairs(own_pairs)
+
+        pair_ids = self._pair_ids
+
+        append_pair = own_pairs.append
+        get_indexes = pair_ids.get
+
+        index = len(own_pairs)
+
+        if keys_altered or self._alter_key is FrozenMagicDict._alter_key:
+            for pair in pairs:
+                key, value = pair
+
+                indexes = get_indexes(key)
+
+                if indexes is None:
+                    pair_ids[key] = [index]
+
+                else:
+                    indexes.append(index)
+
+                # Tuples are immutable, so they can be stored as is.
+                append_pair(pair if type(pair) is tuple else (key, value))
+                index += 1
+
+        else:
+            alter_key = self._alter_key
+
+            for key, value in pairs:
+                key = alter_key(key)
+
+                indexes = get_indexes(key)
+
+                if indexes is None:
+                    pair_ids[key] = [index]
+
+                else:
+                    indexes.append(index)
+
+                append_pair((key, value))
+                index += 1
+
+    def _extend_pairs(
+        self, pairs: Iterable[Tuple[Any, Any]], keys_altered: bool
+    ) -> None:
+        """
+        Add pairs to a dictionary whose pairs are not indexed, they are
+        indexed once there are too many of them to be scanned.
+        """
+        own_pairs = self._pairs
+
+        if keys_altered or self._alter_key is FrozenMagicDict._alter_key:
+            own_pairs.extend([(key, value) for key, value in pairs])
+
+        else:
+            alter_key = self._alter_key
+
+            own_pairs.extend([(alter_key(key), value) for key, value in pairs])
+
+        if len(own_pairs) > self.index_threshold:
+            self._key_index = _index_pairs(own_pairs)
+
+    def _share_storage(self) -> Tuple[Any, ...]:
+        """
+        Return the storage to be shared with another dictionary. Both
+        dictionaries copy the storage before their next modification.
+        """
+        self._shared = True
+
+        return tuple(getattr(self, name) for name in self._storage_fields)
+
+    def _add_storage(self, storage: Tuple[Any, ...]) -> None:
+        """
+        Take over the storage shared by another dictionary with the same
+        storage fields that alters keys the same way.
+
+        This dictionary must be empty.
+        """
+        for name, value in zip(self._storage_fields, storage):
+            setattr(self, name, value)
+
+        self._shared = True
+
+    def _remove_indexes(self, indexes: Sequence[int]) -> None:
+        """
+        Remove pairs at indexes which have already been removed from
+        `_pair_ids`.
+        """
+        pairs = self._pairs
+
+        for index in indexes:
+            pairs[index] = None  # type: ignore
+            self._tombstones += 1
+
+        while pairs and pairs[-1] is None:
+            pairs.pop()
+            self._tombstones -= 1
+
+        if self._tombstones > len(pairs) * self.compaction_threshold:
+            self._compact()
+
+    def _set_one(self, key: _K, value: _V) -> None:
+        """
+        Replace all values of a key whose key has already been altered.
+        """
+        if self._shared:
+            self._unshare()
+
+        indexes = self._pair_ids.pop(key, None)
+
+        if indexes is not None:
+            self._remove_indexes(indexes)
+
+        self._append_pair(key, value)
+
+    def _remove_key(self, key: _K) -> None:
+        """
+        Remove all values of a key whose key has already been altered.
+        """
+        if self._shared and key in self._pair_ids:
+            self._unshare()
+
+        self._remove_indexes(self._pair_ids.pop(key))
+
+    def _compact(self) -> None:
+        pairs = [pair for pair in self._pairs if pair is not None]
+
+        self._pairs = pairs
+        self._pair_ids = _index_pairs(pairs)
+
+        self._tombstones = 0
+        self._compactions += 1
+
+    def compact(self) -> None:
+        """
+        Drop the slots of removed pairs now, instead of waiting for them to
+        pass the `compaction_threshold`.
+        """
+        if not self._tombstones:
+            return
+
+        if self._shared:
+            # Unsharing compacts the storage and copies the rest of it.
+            self._unshare()
+
+        else:
+            self._compact()
+
+    def storage_stats(self) -> StorageStats:
+        """
+        Return how much of the storage is in use.
+        """
+        tombstones = self._tombstones
+
+        return StorageStats(
+            pairs=len(self),
+            slots=len(self) + tombstones,
+            removed=tombstones,
+            keys=len(self._pair_ids),
+            compactions=self._compactions,
+        )
+
+    def _columns(self) -> Tuple[List[_K], List[_V]]:
+        """
+        Return the keys and the values of the pairs as two lists.
+        """
+        pairs = self._pairs
+
+        if self._tombstones:
+            pairs = list(filter(None, pairs))
+
+        return (
+            list(map(operator.itemgetter(0), pairs)),
+            list(map(operator.itemgetter(1), pairs)),
+        )
+
+    def _add_columns(self, keys: Sequence[_K], values: Sequence[_V]) -> None:
+        """
+        Add pairs from the lists returned by `_columns`.
+        """
+        if len(self) or self._shared or self._count_pair is not None:
+            self._add_pairs(zip(keys, values), True)
+
+            return
 
-        if key not in self._first_values:
-            self._first_values[key] = value
-            self._pair_ids[key] = [index]
+        pairs = list(zip(keys, values))
+
+        if self._key_index is None and len(pairs) <= self.index_threshold:
+            self._pairs = pairs
+
+            return
+
+        if len(set(keys)) == len(pairs):
+            # Keys are often distinct, the index can then be built in C.
+            pair_ids = dict(zip(keys, map(list, zip(range(len(pairs))))))
 
         else:
-            self._pair_ids[key].append(index)
+            pair_ids = _index_pairs(pairs)
+
+        self._pairs = pairs
+        self._pair_ids = pair_ids  # type: ignore
+
+    def _pair_at(self, index: int) -> Optional[Tuple[_K, _V]]:
+        """
+        Return the pair at the index, or `None` if it has been removed.
+        """
+        return self._pairs[index]
+
+    def _iter_pairs(self) -> Iterator[Tuple[_K, _V]]:
+        # Pairs are non-empty tuples, so only tombstones are filtered out.
+        return filter(None, self._pairs)
+
+    def _reversed_pairs(self) -> Iterator[Tuple[_K, _V]]:
+        return filter(None, reversed(self._pairs))
 
-        self._kv_pairs[index] = (key, value)
-        self._last_values[key] = value
+    def _has_pair(self, key: Any, value: Any) -> bool:
+        if self._key_index is None:
+            # Tuples compare their items in C.
+            return (key, value) in self._pairs
+
+        try:
+            indexes = self._key_index.get(key)
+
+        except TypeError:  # unhashable key.
+            return False
+
+        if indexes is None:
+            return False
+
+        # `in` compares in C and checks identity before equality.
+        return value in map(
+            operator.itemgetter(1), map(self._pairs.__getitem__, indexes)
+        )
 
     def _has_value(self, value: Any) -> bool:
-        return any(_value == value for _, _value in self._kv_pairs.values())
+        return any(_value == value for _, _value in self._iter_pairs())
 
     def __getitem__(self, key: _K) -> _V:
         key = self._alter_key(key)
+        pair_ids = self._key_index
+
+        if pair_ids is None:
+            if self._scans:
+                self._scans -= 1
+                # Unhashable keys raise as they do with an index, and keys
+                # match as they do in the index.
+                key_hash = hash(key)
+
+                for pair_key, value in self._pairs:
+                    if pair_key is key or (
+                        hash(pair_key) == key_hash and pair_key == key
+                    ):
+                        return value
 
-        return self._first_values[key]
+                raise KeyError(key)
+
+            pair_ids = self._pair_ids
+
+        return self._pairs[pair_ids[key][0]][1]
 
     def __iter__(self) -> Iterator[_K]:
-        for key, _ in self._kv_pairs.values():
-            yield key
+        # `map` iterates in C instead of resuming a generator for each pair.
+        return map(operator.itemgetter(0), self._iter_pairs())
 
     def __len__(self) -> int:
-        return len(self._kv_pairs)
+        return len(self._pairs) - self._tombstones
 
     def __contains__(self, key: Any) -> bool:
         key = self._maybe_alter_key(key)
+        pair_ids = self._key_index
+
+        if pair_ids is None:
+            if self._scans:
+                self._scans -= 1
+                key_hash = hash(key)
+
+                for pair_key, _ in self._pairs:
+                    if pair_key is key or (
+                        hash(pair_key) == key_hash and pair_key == key
+                    ):
+                        return True
+
+                return False
 
-        return key in self._first_values
+            pair_ids = self._pair_ids
+
+        return key in pair_ids
 
     def __eq__(self, obj: Any) -> bool:
+        if isinstance(obj, FrozenMagicDict):
+            if len(self) != len(obj):
+                return False
+
+            # The stored pairs, with their keys already altered, are compared
+            # in C. They are what is hashed, so equal dictionaries hash the
+            # same whichever way they alter their keys.
+            return all(map(operator.eq, self._iter_pairs(), obj._iter_pairs()))
+
         if isinstance(obj, collections.abc.Mapping):
+            if len(self) != len(obj):
+                return False
+
+            if self._alter_key is FrozenMagicDict._alter_key:
+                return all(map(operator.eq, self._iter_pairs(), obj.items()))
+
             return self.items() == obj.items()
 
         return False
@@ -173,15 +691,35 @@ class FrozenMagicDict(Reversible[_K], Mapping[_K, _V], Generic[_K, _V]):
     def __ne__(self, obj: Any) -> bool:
         return not self.__eq__(obj)
 
+    def __hash__(self) -> int:
+        # Hashed like the tuple of its pairs, in order, and only once as the
+        # pairs do not change.
+        try:
+            return self._hash
+
+        except AttributeError:
+            self._hash: int = hash(tuple(self._iter_pairs()))
+
+            return self._hash
+
+    def __reduce_ex__(self, protocol: Any) -> Tuple[Any, ...]:
+        # Only the keys and the values are pickled, the rest of the storage
+        # (and the lock of a `MagicDict`) is rebuilt when it is loaded.
+        keys, values = self._columns()
+
+        return (
+            _rebuild,
+            (self.__class__, keys, values, getattr(self, "__dict__", None)),
+        )
+
     def __str__(self) -> str:
         return "{}({})".format(
             self.__class__.__name__,
-            repr([(key, value) for (key, value) in self._kv_pairs.values()]),
+            repr(list(self._iter_pairs())),
         )
 
     def __reversed__(self) -> Iterator[_K]:
-        for key, _ in reversed(self._kv_pairs.values()):
-            yield key
+        return map(operator.itemgetter(0), self._reversed_pairs())
 
     @typing.overload
     def get_first(self, key: _K) -> Optional[_V]:
@@ -237,9 +775,25 @@ class FrozenMagicDict(Reversible[_K], Mapping[_K, _V], Generic[_K, _V]):
         so that this method never raises a `KeyError`.
         """
         key = self._alter_key(key)
+        pair_ids = self._key_index
+
+        if pair_ids is None:
+            if self._scans:
+                self._scans -= 1
+                key_hash = hash(key)
+
+                for pair_key, value in reversed(self._pairs):
+                    if pair_key is key or (
+                        hash(pair_key) == key_hash and pair_key == key
+                    ):
+                        return value
+
+                return default
+
+            pair_ids = self._pair_ids
 
         try:
-            return self._last_values[key]
+            return self._pairs[pair_ids[key][-1]][1]
 
         except KeyError:
             return default
@@ -250,14 +804,15 @@ class FrozenMagicDict(Reversible[_K], Mapping[_K, _V], Generic[_K, _V]):
         """
         key = self._alter_key(key)
 
-        try:
-            for index in self._pair_ids.get(key, []):
-                _, value = self._kv_pairs[index]
+        pairs = self._pairs
 
-                yield value
+        for index in self._pair_ids.get(key, []):
+            pair = pairs[index]
 
-        except KeyError as e:  # pragma: no cover
-            raise RuntimeError("Dictionary modified during iteration.") from e
+            if pair is None:  # pragma: no cover
+                raise RuntimeError("Dictionary modified during iteration.")
+
+            yield pair[1]
 
     def get_list(self, key: _K) -> List[_V]:
         """
@@ -265,9 +820,197 @@ class FrozenMagicDict(Reversible[_K], Mapping[_K, _V], Generic[_K, _V]):
         """
         return list(self.get_iter(key))
 
+    def count(self, key: _K) -> int:
+        """
+        Return the number of values of the key, without building a list of
+        them.
+        """
+        indexes = self._pair_ids.get(self._alter_key(key))
+
+        return 0 if indexes is None else len(indexes)
+
+    def key_count(self) -> int:
+        """
+        Return the number of distinct keys, `len` returns the number of
+        pairs.
+        """
+        return len(self._pair_ids)
+
+    def unique_keys(self) -> KeysView[_K]:
+        """
+        Return a set-like view of the distinct keys, its length and
+        membership tests do not go through the pairs.
+        """
+        return _UniqueKeysView(self)
+
+    def _alter_keys(self, keys: Iterable[Any]) -> Iterable[Any]:
+        """
+        Alter keys in bulk for the batch lookups.
+        """
+        if self._alter_key is FrozenMagicDict._alter_key:
+            return keys
+
+        return map(self._alter_key, keys)
+
+    @typing.overload
+    def get_many(self, keys: Iterable[_K]) -> List[Optional[_V]]:
+        ...
+
+    @typing.overload
+    def get_many(
+        self, keys: Iterable[_K], default: _T = ...
+    ) -> List[Union[_V, _T]]:
+        ...
+
+    def get_many(
+        self, keys: Iterable[_K], default: Optional[_T] = None
+    ) -> List[Any]:
+        """
+        Return a list of the first value of each key, or default for the
+        keys that are not in the dictionary.
+
+        All the keys are looked up in one pass, which is faster than calling
+        `get_first` for each key.
+        """
+        pairs = self._pairs
+
+        return [
+            default if indexes is None else pairs[indexes[0]][1]
+            for indexes in map(self._pair_ids.get, self._alter_keys(keys))
+        ]
+
+    @typing.overload
+    def get_last_many(self, keys: Iterable[_K]) -> List[Optional[_V]]:
+        ...
+
+    @typing.overload
+    def get_last_many(
+        self, keys: Iterable[_K], default: _T = ...
+    ) -> List[Union[_V, _T]]:
+        ...
+
+    def get_last_many(
+        self, keys: Iterable[_K], default: Optional[_T] = None
+    ) -> List[Any]:
+        """
+        Return a list of the last value of each key, or default for the keys
+        that are not in the dictionary.
+        """
+        pairs = self._pairs
+
+        return [
+            default if indexes is None else pairs[indexes[-1]][1]
+            for indexes in map(self._pair_ids.get, self._alter_keys(keys))
+        ]
+
+    def get_list_many(self, keys: Iterable[_K]) -> List[List[_V]]:
+        """
+        Return a list of the lists of all the values of each key.
+        """
+        pairs = self._pairs
+        get_indexes = self._pair_ids.get
+
+        return [
+            [pairs[index][1] for index in get_indexes(key, ())]
+            for key in self._alter_keys(keys)
+        ]
+
     def copy(self) -> "FrozenMagicDict[_K, _V]":
         return self.__class__(self)
 
+    def _derive(self: _D, key: Any) -> _D:
+        """
+        Return a copy of this dictionary where only the pairs of the altered
+        key are going to be changed.
+
+        The pair list and the index are copied as a whole, the pairs and the
+        indexes of other keys are not. The copy must be marked as shared
+        once it has been changed.
+        """
+        dic = self.__class__()
+
+        for name in self._storage_fields:
+            setattr(dic, name, getattr(self, name))
+
+        self._shared = True
+
+        dic._pairs = self._pairs.copy()
+        dic._pair_ids = self._pair_ids.copy()
+
+        indexes = dic._pair_ids.get(key)
+
+        if indexes is not None:
+            dic._pair_ids[key] = indexes.copy()
+
+        return dic
+
+    def _from_pairs(self: _D, pairs: Iterable[Tuple[Any, Any]]) -> _D:
+        """
+        Return a new dictionary of the same kind with pairs whose keys have
+        already been altered.
+        """
+        dic = self.__class__()
+        dic._add_pairs(pairs, True)
+
+        return dic
+
+    def with_added(self: _D, key: Any, value: Any) -> _D:
+        """
+        Return a new dictionary with the value added to the key, the
+        existing values are kept.
+
+        This copies the list of pairs and the key index, so it takes time
+        proportional to the size of the dictionary.
+        """
+        key = self._alter_key(key)
+
+        dic = self._derive(key)
+        dic._append_pair(key, value)
+        dic._shared = True
+
+        return dic
+
+    def with_set(self: _D, key: Any, value: Any) -> _D:
+        """
+        Return a new dictionary where the value replaces all the existing
+        values of the key.
+        """
+        key = self._alter_key(key)
+
+        dic = self._derive(key)
+        dic._set_one(key, value)
+        dic._shared = True
+
+        return dic
+
+    def without(self: _D, key: Any) -> _D:
+        """
+        Return a new dictionary without any value of the key.
+
+        Raises `KeyError` if the key is not in the dictionary.
+        """
+        key = self._alter_key(key)
+
+        if key not in self._pair_ids:
+            raise KeyError(key)
+
+        dic = self._derive(key)
+        dic._remove_key(key)
+        dic._shared = True
+
+        return dic
+
+    def merged(self: _D, *args: Any, **kwargs: Any) -> _D:
+        """
+        Return a new dictionary with the pairs from a mapping, an iterable
+        and / or keyword arguments added after the existing ones, like
+        `MagicDict.update` does.
+        """
+        dic = self.__class__(self)
+        dic._update(args, kwargs)
+
+        return dic
+
     def keys(self) -> MagicKeysView[_K]:
         return MagicKeysView(self)
 
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#   Copyright 2021 Kaede Hoshikawa
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+from typing import (
+    Any,
+    Generic,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+import typing
+
+from ._frozen_dict import FrozenMagicDict
+
+__all__ = ["FrozenFingerprintedMagicDict"]
+
+_K = TypeVar("_K")
+
+_V = TypeVar("_V")
+
+# Fingerprints are kept to 64 bits.
+_MASK = (1 << 64) - 1
+
+
+class _FingerprintMixin(FrozenMagicDict[_K, _V], Generic[_K, _V]):
+    """
+    Keeps a fingerprint of the pairs stored, the sum of their hashes, so
+    that dictionaries with different pairs are found unequal without
+    comparing them. Pairs with unhashable values cannot be fingerprinted,
+    dictionaries with such pairs are compared pair by pair.
+
+    Subclasses need to provide the `_fingerprint` and `_unhashable_pairs`
+    slots.
+    """
+
+    __slots__ = ()
+
+    _storage_fields = FrozenMagicDict._storage_fields + (
+        "_fingerprint",
+        "_unhashable_pairs",
+    )
+
+    _fingerprint: int
+    _unhashable_pairs: int
+
+    def _init_storage(self) -> None:
+        super()._init_storage()
+
+        self._fingerprint = 0
+        self._unhashable_pairs = 0
+
+    def _count_pair(self, pair: Tuple[Any, Any]) -> None:
+        try:
+            self._fingerprint = (self._fingerprint + hash(pair)) & _MASK
+
+        except TypeError:
+            self._unhashable_pairs += 1
+
+    def _discount_pair(self, pair: Tuple[Any, Any]) -> None:
+        try:
+            self._fingerprint = (self._fingerprint - hash(pair)) & _MASK
+
+        except TypeError:
+            self._unhashable_pairs -= 1
+
+    def _add_one(self, key: _K, value: _V) -> None:
+        super()._add_one(key, value)
+
+        self._count_pair(self._pairs[-1])
+
+    def _append_pair(self, key: _K, value: _V) -> None:
+        super()._append_pair(key, value)
+
+        self._count_pair(self._pairs[-1])
+
+    def _remove_indexes(self, indexes: Sequence[int]) -> None:
+        pairs = self._pairs
+
+        for index in indexes:
+            self._discount_pair(pairs[index])
+
+        super()._remove_indexes(indexes)
+
+    def __eq__(self, obj: Any) -> bool:
+        if (
+            isinstance(obj, _FingerprintMixin)
+            and not (self._unhashable_pairs or obj._unhashable_pairs)
+            and self._fingerprint != obj._fingerprint
+        ):
+            return False
+
+        return super().__eq__(obj)
+
+
+class FrozenFingerprintedMagicDict(_FingerprintMixin[_K, _V], Generic[_K, _V]):
+    """
+    `FrozenFingerprintedMagicDict` has exactly the same functionality as
+    `FrozenMagicDict`. However, it keeps a fingerprint of its pairs so
+    comparing it with a dictionary that has different pairs does not go
+    through them.
+    """
+
+    __slots__ = ("_fingerprint", "_unhashable_pairs")
+
+    # Defining `__eq__` in the mixin has unset it.
+    __hash__ = FrozenMagicDict.__hash__
+
+    def copy(self) -> "FrozenFingerprintedMagicDict[_K, _V]":
+        return self.__class__(self)
+
+    @classmethod
+    @typing.overload
+    def fromkeys(
+        cls, keys: Iterable[_K]
+    ) -> "FrozenFingerprintedMagicDict[_K, None]":
+        ...
+
+    @classmethod
+    @typing.overload
+    def fromkeys(
+        cls, keys: Iterable[_K], value: _V
+    ) -> "FrozenFingerprintedMagicDict[_K, _V]":
+        ...
+
+    @classmethod
+    def fromkeys(  # type: ignore
+        cls, keys: Iterable[_K], value: Optional[_V] = None
+    ) -> Union[
+        "FrozenFingerprintedMagicDict[_K, None]",
+        "FrozenFingerprintedMagicDict[_K, _V]",
+    ]:
+        def _gen() -> Iterator[Tuple[_K, Optional[_V]]]:
+            for k in keys:
+                yield (k, value)
+
+        return cls(_gen())  # type: ignore
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#   Copyright 2021 Kaede Hoshikawa
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+from typing import Any, Generic, Iterable, Mapping, Tuple, TypeVar, Union
+import contextlib
+import mmap
+import os
+
+from ._frozen_shared_dict import _FrozenTableMagicDict, _write_table
+
+__all__ = ["FrozenMappedMagicDict"]
+
+_K = TypeVar("_K")
+
+_V = TypeVar("_V")
+
+_Path = Union[str, "os.PathLike[str]"]
+
+
+class FrozenMappedMagicDict(_FrozenTableMagicDict[_K, _V], Generic[_K, _V]):
+    """
+    An immutable ordered, one-to-many Mapping read from a file written by
+    `FrozenMappedMagicDict.write`.
+
+    The file is memory-mapped and keys are found through the hashed index in
+    the file, so opening it does not read the pairs and the pages are shared
+    by all the processes that open the same file. Values are unpickled when
+    they are read.
+    """
+
+    __slots__ = ("_path", "_mmap")
+
+    def __init__(self, path: _Path) -> None:
+        self._path = path
+
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._open_table(memoryview(self._mmap))
+
+    @staticmethod
+    def write(
+        path: _Path,
+        pairs: Union[Mapping[Any, Any], Iterable[Tuple[Any, Any]]],
+    ) -> None:
+        """
+        Write the pairs from a mapping or an iterable to a file, which can
+        then be opened with `FrozenMappedMagicDict(path)`.
+
+        The pairs are streamed to the file, only the keys and the numbers of
+        their pairs are kept in memory until all of the pairs are written.
+        """
+        if isinstance(pairs, Mapping):
+            pairs = pairs.items()
+
+        with open(path, "wb") as f:
+            _write_table(pairs, f)
+
+    @property
+    def path(self) -> _Path:
+        """
+        The path of the file.
+        """
+        return self._path
+
+    def close(self) -> None:
+        """
+        Unmap the file, the dictionary can not be used afterwards.
+        """
+        self._release_table()
+        self._mmap.close()
+
+    def __del__(self) -> None:
+        # The buffer has to be released before the file is unmapped.
+        with contextlib.suppress(AttributeError):
+            self.close()
+
+    def __reduce_ex__(self, protocol: Any) -> Tuple[Any, ...]:
+        # The file is opened again instead of copying the pairs.
+        return (self.__class__, (self._path,))
+
+    @classmethod
+    def fromkeys(
+        cls, keys: Iterable[Any], value: Any = None
+    ) -> "FrozenMappedMagicDict[Any, Any]":
+        # The dictionary is opened from a file, it has to be written first.
+        raise TypeError(
+            "FrozenMappedMagicDict can not be created from keys, write them "
+            "with FrozenMappedMagicDict.write(path, pairs) and open the path "
+            "instead."
+        )
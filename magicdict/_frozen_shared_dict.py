@@ -0,0 +1,666 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#   Copyright 2021 Kaede Hoshikawa
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+import array
+import contextlib
+import io
+import os
+import pickle
+import struct
+import sys
+import typing
+import zlib
+
+from ._frozen_dict import FrozenMagicDict
+
+try:
+    from multiprocessing import resource_tracker, shared_memory
+
+except ImportError:  # pragma: no cover
+    # Python < 3.8.
+    resource_tracker = shared_memory = None  # type: ignore
+
+__all__ = ["FrozenSharedMagicDict"]
+
+_K = TypeVar("_K")
+
+_V = TypeVar("_V")
+
+_T = TypeVar("_T")
+
+# The table is a flat buffer of little-endian 64-bit words:
+#
+# - the header;
+# - a record per pair: the key number, the size of the value and the pickled
+#   value;
+# - a record per key: the size of the key, the number of pairs, the pickled
+#   key and the numbers of the pairs of the key (the value chain);
+# - the offsets of the keys, ordered by key number;
+# - the offsets of the pairs, in insertion order;
+# - the hashed index of the keys: slots of the crc32 of the pickled key and
+#   the offset of the key, `0` for empty slots. Slots are probed linearly.
+#
+# Records are padded to whole words so the buffer can be read as words.
+_MAGIC = b"MAGICDCT"
+
+# Version 2 pickles keys without the memo, see `_dump_key`.
+_VERSION = 2
+
+_HEADER = struct.Struct("<8s8Q")
+
+_RECORD = struct.Struct("<2Q")
+
+_PADDING = bytes(8)
+
+# Keys are looked up by their pickled form, so the protocol never changes.
+_PROTOCOL = 4
+
+# Keys made of a single object, the memo does not change how they are
+# pickled.
+_ATOMIC_KEY_TYPES = frozenset((str, bytes, int, float, bool, type(None)))
+
+
+def _padded(size: int) -> int:
+    return (size + 7) & ~7
+
+
+def _words_to_bytes(words: "array.array[int]") -> bytes:
+    if sys.byteorder == "big":  # pragma: no cover
+        words = array.array("Q", words)
+        words.byteswap()
+
+    return words.tobytes()
+
+
+def _as_words(buf: memoryview) -> Sequence[int]:
+    if sys.byteorder == "big":  # pragma: no cover
+        # The words can not be shared, they are swapped in a copy.
+        words = array.array("Q", buf.tobytes())
+        words.byteswap()
+
+        return words
+
+    return buf.cast("Q")
+
+
+def _dump_key(key: Any) -> bytes:
+    """
+    Pickle a key to be looked up.
+
+    The memo makes the pickled form of a key depend on which of its parts
+    are the same object: `(s, s)` would not match an equal `(s, t)` where
+    `t` is a copy of `s`, so keys made of multiple objects are pickled
+    without it.
+    """
+    if type(key) in _ATOMIC_KEY_TYPES:
+        return pickle.dumps(key, _PROTOCOL)
+
+    file = io.BytesIO()
+    pickler = pickle.Pickler(file, _PROTOCOL)
+    pickler.fast = True
+    pickler.dump(key)
+
+    return file.getvalue()
+
+
+def _record(first: int, second: int, data: bytes) -> bytes:
+    return _RECORD.pack(first, second) + data + _PADDING[: -len(data) & 7]
+
+
+def _slot_index(key_hash: int, shift: int) -> int:
+    # crc32 does not spread similar keys well, so the index is taken from
+    # the top bits of the hash multiplied by a 64-bit constant.
+    return ((key_hash * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> shift
+
+
+def _write_table(pairs: Iterable[Tuple[Any, Any]], file: BinaryIO) -> int:
+    """
+    Write the pairs to a seekable file as a table, starting at the current
+    position, and return the size of the table.
+
+    The pairs are written as they come. The key index and the value chains
+    are kept in memory and written after the last pair.
+    """
+    start = file.tell()
+    file.write(bytes(_HEADER.size))
+    offset = _HEADER.size
+
+    key_ids: Dict[Any, int] = {}
+    pickled_keys: List[bytes] = []
+    chains: List["array.array[int]"] = []
+    pair_offsets = array.array("Q")
+
+    for key, value in pairs:
+        key_id = key_ids.get(key)
+
+        if key_id is None:
+            key_id = key_ids[key] = len(pickled_keys)
+            pickled_keys.append(_dump_key(key))
+            chains.append(array.array("Q"))
+
+        chains[key_id].append(len(pair_offsets))
+        pair_offsets.append(offset)
+
+        pickled_value = pickle.dumps(value, _PROTOCOL)
+        record = _record(key_id, len(pickled_value), pickled_value)
+        file.write(record)
+        offset += len(record)
+
+    slot_count = 8
+
+    while slot_count < len(pickled_keys) * 2:
+        slot_count *= 2
+
+    mask = slot_count - 1
+    shift = 65 - slot_count.bit_length()
+    slots = array.array("Q", bytes(_RECORD.size * slot_count))
+    key_offsets = array.array("Q")
+
+    for pickled_key, chain in zip(pickled_keys, chains):
+        key_hash = zlib.crc32(pickled_key)
+        index = _slot_index(key_hash, shift)
+
+        while slots[index * 2 + 1]:
+            index = (index + 1) & mask
+
+        slots[index * 2] = key_hash
+        slots[index * 2 + 1] = offset
+        key_offsets.append(offset)
+
+        record = _record(len(pickled_key), len(chain), pickled_key)
+        file.write(record)
+        file.write(_words_to_bytes(chain))
+        offset += len(record) + len(chain) * 8
+
+    sections = []
+
+    for words in (key_offsets, pair_offsets, slots):
+        sections.append(offset)
+        file.write(_words_to_bytes(words))
+        offset += len(words) * 8
+
+    file.seek(start)
+    file.write(
+        _HEADER.pack(
+            _MAGIC,
+            _VERSION,
+            offset,
+            len(pair_offsets),
+            len(pickled_keys),
+            slot_count,
+            *sections,
+        )
+    )
+    file.seek(start + offset)
+
+    return offset
+
+
+class _Table(Mapping[Any, Sequence[int]]):
+    """
+    Reads a table from a buffer without copying it.
+
+    As a Mapping, it maps the keys to the numbers of their pairs, which is
+    what `_pair_ids` of a `FrozenMagicDict` is.
+    """
+
+    __slots__ = (
+        "_buf",
+        "_words",
+        "_key_offsets",
+        "_pair_offsets",
+        "_slots",
+        "_mask",
+        "_shift",
+        "pair_count",
+    )
+
+    def __init__(self, buf: memoryview) -> None:
+        (
+            magic,
+            version,
+            size,
+            pair_count,
+            key_count,
+            slot_count,
+            key_offsets,
+            pair_offsets,
+            slots,
+        ) = _HEADER.unpack_from(buf)
+
+        if magic != _MAGIC:
+            raise ValueError("The buffer does not contain a table.")
+
+        if version != _VERSION:
+            raise ValueError("Unsupported table version: {}.".format(version))
+
+        self._buf = buf = buf[:size]
+        self._words = words = _as_words(buf)
+
+        self._key_offsets = words[
+            key_offsets // 8 : key_offsets // 8 + key_count
+        ]
+        self._pair_offsets = words[
+            pair_offsets // 8 : pair_offsets // 8 + pair_count
+        ]
+        self._slots = words[slots // 8 : slots // 8 + slot_count * 2]
+        self._mask = slot_count - 1
+        self._shift = 65 - slot_count.bit_length()
+
+        self.pair_count: int = pair_count
+
+    def release(self) -> None:
+        """
+        Release the buffer, the table can not be read afterwards.
+        """
+        for view in (
+            self._slots,
+            self._pair_offsets,
+            self._key_offsets,
+            self._words,
+            self._buf,
+        ):
+            if isinstance(view, memoryview):
+                view.release()
+
+    def _read_key(self, key_id: int) -> Any:
+        offset = self._key_offsets[key_id]
+        size = self._words[offset // 8]
+
+        return pickle.loads(self._buf[offset + 16 : offset + 16 + size])
+
+    def _read_chain(self, offset: int, pickled_key: bytes) -> Optional[Any]:
+        word = offset // 8
+        size = self._words[word]
+
+        if self._buf[offset + 16 : offset + 16 + size] != pickled_key:
+            return None
+
+        start = word + 2 + _padded(size) // 8
+
+        return self._words[start : start + self._words[word + 1]]
+
+    def read_value(self, pair_id: int) -> Any:
+        offset = self._pair_offsets[pair_id]
+        size = self._words[offset // 8 + 1]
+
+        return pickle.loads(self._buf[offset + 16 : offset + 16 + size])
+
+    def read_pairs(self, pair_ids: Iterable[int]) -> Iterator[Tuple[Any, Any]]:
+        # Each key is unpickled once per iteration, its pairs share the key.
+        keys: Dict[int, Any] = {}
+
+        for pair_id in pair_ids:
+            key_id = self._words[self._pair_offsets[pair_id] // 8]
+
+            try:
+                key = keys[key_id]
+
+            except KeyError:
+                key = keys[key_id] = self._read_key(key_id)
+
+            yield (key, self.read_value(pair_id))
+
+    def __getitem__(self, key: Any) -> Sequence[int]:
+        # Unhashable keys raise a `TypeError` like they do with a dict.
+        hash(key)
+
+        pickled_key = _dump_key(key)
+        key_hash = zlib.crc32(pickled_key)
+        slots = self._slots
+        index = _slot_index(key_hash, self._shift)
+
+        while True:
+            offset = slots[index * 2 + 1]
+
+            if not offset:
+                raise KeyError(key)
+
+            if slots[index * 2] == key_hash:
+                chain = self._read_chain(offset, pickled_key)
+
+                if chain is not None:
+                    return typing.cast(Sequence[int], chain)
+
+            index = (index + 1) & self._mask
+
+    def __iter__(self) -> Iterator[Any]:
+        return map(self._read_key, range(len(self._key_offsets)))
+
+    def __len__(self) -> int:
+        return len(self._key_offsets)
+
+
+class _TablePairs(Sequence[Tuple[Any, Any]]):
+    """
+    The pairs of a table as a read-only `_pairs` list.
+    """
+
+    __slots__ = ("_table",)
+
+    def __init__(self, table: _Table) -> None:
+        self._table = table
+
+    @typing.overload
+    def __getitem__(self, index: int) -> Tuple[Any, Any]:
+        ...
+
+    @typing.overload
+    def __getitem__(self, index: slice) -> List[Tuple[Any, Any]]:
+        ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[Tuple[Any, Any], List[Tuple[Any, Any]]]:
+        pair_ids = range(self._table.pair_count)[index]
+
+        if isinstance(pair_ids, int):
+            return next(self._table.read_pairs((pair_ids,)))
+
+        return list(self._table.read_pairs(pair_ids))
+
+    def __iter__(self) -> Iterator[Tuple[Any, Any]]:
+        return self._table.read_pairs(range(self._table.pair_count))
+
+    def __reversed__(self) -> Iterator[Tuple[Any, Any]]:
+        return self._table.read_pairs(reversed(range(self._table.pair_count)))
+
+    def __len__(self) -> int:
+        return self._table.pair_count
+
+
+class _FrozenTableMagicDict(FrozenMagicDict[_K, _V], Generic[_K, _V]):
+    """
+    Reads the pairs from a table in a buffer. The table serves as both
+    `_pairs` and `_pair_ids`, which are never modified.
+    """
+
+    __slots__ = ()
+
+    _storage_fields = ("_pairs", "_pair_ids")
+
+    def _open_table(self, buf: memoryview) -> None:
+        table = _Table(buf)
+
+        self._pairs = _TablePairs(table)  # type: ignore
+        self._pair_ids = table  # type: ignore
+
+        self._tombstones = 0
+        self._compactions = 0
+        self._shared = False
+
+    def _release_table(self) -> None:
+        typing.cast(_Table, self._pair_ids).release()
+
+    def __getitem__(self, key: _K) -> _V:
+        key = self._alter_key(key)
+        table = typing.cast(_Table, self._pair_ids)
+
+        return typing.cast(_V, table.read_value(table[key][0]))
+
+    @typing.overload
+    def get_last(self, key: _K) -> Optional[_V]:
+        ...
+
+    @typing.overload
+    def get_last(self, key: _K, default: _T = ...) -> Union[_V, _T]:
+        ...
+
+    def get_last(
+        self, key: _K, default: Optional[_T] = None
+    ) -> Optional[Union[_V, _T]]:
+        key = self._alter_key(key)
+        table = typing.cast(_Table, self._pair_ids)
+
+        try:
+            return typing.cast(_V, table.read_value(table[key][-1]))
+
+        except KeyError:
+            return default
+
+    def get_iter(self, key: _K) -> Iterator[_V]:
+        key = self._alter_key(key)
+        table = typing.cast(_Table, self._pair_ids)
+
+        try:
+            pair_ids = table[key]
+
+        except KeyError:
+            return
+
+        for pair_id in pair_ids:
+            yield table.read_value(pair_id)
+
+    @typing.overload
+    def get_many(self, keys: Iterable[_K]) -> List[Optional[_V]]:
+        ...
+
+    @typing.overload
+    def get_many(
+        self, keys: Iterable[_K], default: _T = ...
+    ) -> List[Union[_V, _T]]:
+        ...
+
+    def get_many(
+        self, keys: Iterable[_K], default: Optional[_T] = None
+    ) -> List[Any]:
+        table = typing.cast(_Table, self._pair_ids)
+
+        return [
+            default if pair_ids is None else table.read_value(pair_ids[0])
+            for pair_ids in map(table.get, self._alter_keys(keys))
+        ]
+
+    @typing.overload
+    def get_last_many(self, keys: Iterable[_K]) -> List[Optional[_V]]:
+        ...
+
+    @typing.overload
+    def get_last_many(
+        self, keys: Iterable[_K], default: _T = ...
+    ) -> List[Union[_V, _T]]:
+        ...
+
+    def get_last_many(
+        self, keys: Iterable[_K], default: Optional[_T] = None
+    ) -> List[Any]:
+        table = typing.cast(_Table, self._pair_ids)
+
+        return [
+            default if pair_ids is None else table.read_value(pair_ids[-1])
+            for pair_ids in map(table.get, self._alter_keys(keys))
+        ]
+
+    def get_list_many(self, keys: Iterable[_K]) -> List[List[_V]]:
+        table = typing.cast(_Table, self._pair_ids)
+
+        return [
+            list(map(table.read_value, table.get(key, ())))
+            for key in self._alter_keys(keys)
+        ]
+
+    def copy(self) -> "FrozenMagicDict[_K, _V]":
+        # Copies and derived dictionaries are kept in this process.
+        return FrozenMagicDict(self)
+
+    def _derive(self, key: Any) -> "FrozenMagicDict[_K, _V]":  # type: ignore
+        return FrozenMagicDict(self)
+
+    def _from_pairs(  # type: ignore
+        self, pairs: Iterable[Tuple[Any, Any]]
+    ) -> "FrozenMagicDict[_K, _V]":
+        dic: "FrozenMagicDict[_K, _V]" = FrozenMagicDict()
+        dic._add_pairs(pairs, True)
+
+        return dic
+
+    def merged(  # type: ignore
+        self, *args: Any, **kwargs: Any
+    ) -> "FrozenMagicDict[_K, _V]":
+        dic = FrozenMagicDict(self)
+        dic._update(args, kwargs)
+
+        return dic
+
+
+def _attach(
+    cls: "typing.Type[FrozenSharedMagicDict[Any, Any]]", name: str
+) -> "FrozenSharedMagicDict[Any, Any]":
+    return cls.attach(name)
+
+
+class FrozenSharedMagicDict(_FrozenTableMagicDict[_K, _V], Generic[_K, _V]):
+    """
+    An immutable ordered, one-to-many Mapping stored in a shared memory
+    block, which other processes attach to without copying the pairs.
+
+    Keys and values are pickled into the block and unpickled when they are
+    read. Keys are looked up by their pickled form, so keys that are equal
+    but pickled differently do not match each other: `1` and `1.0`, or
+    frozensets with the same items in a different order.
+    """
+
+    __slots__ = ("_shm",)
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        if shared_memory is None:  # pragma: no cover
+            raise RuntimeError(
+                "FrozenSharedMagicDict requires Python 3.8 or later."
+            )
+
+        file = io.BytesIO()
+        size = _write_table(
+            FrozenMagicDict(*args, **kwargs)._iter_pairs(), file
+        )
+
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        typing.cast(memoryview, shm.buf)[:size] = file.getbuffer()
+
+        self._open(shm)
+
+    def _open(self, shm: "shared_memory.SharedMemory") -> None:
+        self._shm = shm
+        self._open_table(typing.cast(memoryview, shm.buf))
+
+    @classmethod
+    def attach(cls, name: str) -> "FrozenSharedMagicDict[Any, Any]":
+        """
+        Attach to a dictionary in the shared memory block with the name.
+        """
+        if shared_memory is None:  # pragma: no cover
+            raise RuntimeError(
+                "FrozenSharedMagicDict requires Python 3.8 or later."
+            )
+
+        if sys.version_info >= (3, 13):
+            # The process that created the block is the one to unlink it.
+            shm = shared_memory.SharedMemory(name, track=False)
+
+        else:  # pragma: no cover
+            shm = shared_memory.SharedMemory(name)
+
+            if os.name == "posix":
+                # Attaching registers the block with the resource tracker,
+                # which unlinks it when a process that was not started by
+                # the one that created the block exits.
+                resource_tracker.unregister(
+                    shm._name, "shared_memory"  # type: ignore
+                )
+
+        dic = cls.__new__(cls)
+        dic._open(shm)
+
+        return dic
+
+    @property
+    def name(self) -> str:
+        """
+        The name of the shared memory block to attach to.
+        """
+        return self._shm.name
+
+    def close(self) -> None:
+        """
+        Close the access to the shared memory block from this dictionary,
+        which can not be used afterwards.
+        """
+        self._release_table()
+        self._shm.close()
+
+    def __del__(self) -> None:
+        # The buffer has to be released before the block is closed.
+        with contextlib.suppress(AttributeError):
+            self.close()
+
+    def unlink(self) -> None:
+        """
+        Destroy the shared memory block once all the dictionaries have
+        closed it. It should be called once, by the process that created the
+        dictionary.
+        """
+        if sys.version_info < (3, 13) and os.name == "posix":
+            # A process sharing the resource tracker of this one may have
+            # unregistered the block when attaching to it, it is registered
+            # again so unlinking does not unregister it twice.
+            resource_tracker.register(
+                self._shm._name, "shared_memory"  # type: ignore
+            )
+
+        self._shm.unlink()
+
+    def __reduce_ex__(self, protocol: Any) -> Tuple[Any, ...]:
+        # Other processes attach to the block instead of copying the pairs.
+        return (_attach, (self.__class__, self.name))
+
+    @classmethod
+    @typing.overload
+    def fromkeys(cls, keys: Iterable[_K]) -> "FrozenSharedMagicDict[_K, None]":
+        ...
+
+    @classmethod
+    @typing.overload
+    def fromkeys(
+        cls, keys: Iterable[_K], value: _V
+    ) -> "FrozenSharedMagicDict[_K, _V]":
+        ...
+
+    @classmethod
+    def fromkeys(  # type: ignore
+        cls, keys: Iterable[_K], value: Optional[_V] = None
+    ) -> Union[
+        "FrozenSharedMagicDict[_K, None]", "FrozenSharedMagicDict[_K, _V]"
+    ]:
+        def _gen() -> Iterator[Tuple[_K, Optional[_V]]]:
+            for k in keys:
+                yield (k, value)
+
+        return cls(_gen())
@@ -26,6 +26,7 @@ from typing import (
     TypeVar,
     Union,
 )
+import functools
 import typing
 
 from ._frozen_dict import FrozenMagicDict
@@ -34,6 +35,79 @@ _V = TypeVar("_V")
 
 __all__ = ["FrozenTolerantMagicDict"]
 
+_KEY_CACHE_SIZE = 1024
+
+# Header names looked up on (almost) every request.
+_COMMON_KEYS = (
+    "Accept",
+    "Accept-Charset",
+    "Accept-Encoding",
+    "Accept-Language",
+    "Accept-Ranges",
+    "Access-Control-Allow-Origin",
+    "Age",
+    "Allow",
+    "Authorization",
+    "Cache-Control",
+    "Connection",
+    "Content-Disposition",
+    "Content-Encoding",
+    "Content-Language",
+    "Content-Length",
+    "Content-Location",
+    "Content-Range",
+    "Content-Type",
+    "Cookie",
+    "Date",
+    "ETag",
+    "Expect",
+    "Expires",
+    "Forwarded",
+    "Host",
+    "If-Match",
+    "If-Modified-Since",
+    "If-None-Match",
+    "If-Range",
+    "If-Unmodified-Since",
+    "Keep-Alive",
+    "Last-Modified",
+    "Link",
+    "Location",
+    "Origin",
+    "Pragma",
+    "Proxy-Authorization",
+    "Range",
+    "Referer",
+    "Retry-After",
+    "Server",
+    "Set-Cookie",
+    "Te",
+    "Trailer",
+    "Transfer-Encoding",
+    "Upgrade",
+    "User-Agent",
+    "Vary",
+    "Via",
+    "WWW-Authenticate",
+    "X-Forwarded-For",
+    "X-Forwarded-Host",
+    "X-Forwarded-Proto",
+    "X-Real-IP",
+    "X-Requested-With",
+)
+
+
+@functools.lru_cache(maxsize=_KEY_CACHE_SIZE)
+def _fold_key(key: Any) -> Any:
+    # Cached so that the same folded key (with its hash already computed) is
+    # returned for the same key instead of a new string for every lookup.
+    return key.lower()
+
+
+for _key in _COMMON_KEYS:
+    _fold_key(_key)
+    _fold_key(_key.lower())
+
 
 class FrozenTolerantMagicDict(
     FrozenMagicDict[AnyStr, _V], Generic[AnyStr, _V]
@@ -45,17 +119,23 @@ class FrozenTolerantMagicDict(
 
     __slots__ = ()
 
-    @staticmethod
-    def _alter_key(key: AnyStr) -> AnyStr:
-        return key.lower()
+    _alter_key = staticmethod(_fold_key)
 
     @staticmethod
     def _maybe_alter_key(key: Any) -> Any:
         if isinstance(key, (str, bytes)):
-            return key.lower()
+            return _fold_key(key)
 
         return key
 
+    @staticmethod
+    def key_cache_info() -> "functools._CacheInfo":
+        """
+        Return the hits, misses and the size of the cache of case-folded
+        keys shared by all case-insensitive dictionaries.
+        """
+        return _fold_key.cache_info()
+
     def copy(self) -> "FrozenTolerantMagicDict[AnyStr, _V]":
         return self.__class__(self)
 
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#   Copyright 2021 Kaede Hoshikawa
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+import typing
+
+from ._frozen_dict import FrozenMagicDict
+
+__all__ = ["FrozenValueIndexedMagicDict"]
+
+_K = TypeVar("_K")
+
+_V = TypeVar("_V")
+
+_D = TypeVar("_D", bound="_ValueIndexMixin[Any, Any]")
+
+
+class _ValueIndexMixin(FrozenMagicDict[_K, _V], Generic[_K, _V]):
+    """
+    Keeps count of the values stored so that `value in dic.values()` does
+    not scan the dictionary. Unhashable values cannot be counted and are
+    still found by a scan.
+
+    Subclasses need to provide the `_value_counts` and `_unhashable_values`
+    slots.
+    """
+
+    __slots__ = ()
+
+    _storage_fields = FrozenMagicDict._storage_fields + (
+        "_value_counts",
+        "_unhashable_values",
+    )
+
+    _value_counts: Dict[Any, int]
+    _unhashable_values: int
+
+    def _init_storage(self) -> None:
+        super()._init_storage()
+
+        self._value_counts = {}
+        self._unhashable_values = 0
+
+    def _unshare(self) -> None:
+        super()._unshare()
+
+        self._value_counts = self._value_counts.copy()
+
+    def _derive(self: _D, key: Any) -> _D:
+        dic = super()._derive(key)
+        dic._value_counts = self._value_counts.copy()
+
+        return dic
+
+    def _count_value(self, value: Any) -> None:
+        try:
+            self._value_counts[value] = self._value_counts.get(value, 0) + 1
+
+        except TypeError:
+            self._unhashable_values += 1
+
+    def _discount_value(self, value: Any) -> None:
+        try:
+            count = self._value_counts.pop(value)
+
+        except TypeError:
+            self._unhashable_values -= 1
+
+        else:
+            if count > 1:
+                self._value_counts[value] = count - 1
+
+    def _add_one(self, key: _K, value: _V) -> None:
+        super()._add_one(key, value)
+
+        self._count_value(value)
+
+    def _append_pair(self, key: _K, value: _V) -> None:
+        super()._append_pair(key, value)
+
+        self._count_value(value)
+
+    def _count_pair(self, pair: Tuple[Any, Any]) -> None:
+        self._count_value(pair[1])
+
+    def _remove_indexes(self, indexes: Sequence[int]) -> None:
+        pairs = self._pairs
+
+        for index in indexes:
+            self._discount_value(pairs[index][1])
+
+        super()._remove_indexes(indexes)
+
+    def _may_have_value(self, value: Any) -> bool:
+        try:
+            if value in self._value_counts:
+                return True
+
+        except TypeError:
+            return True
+
+        # An unhashable value may still be equal to a hashable one.
+        return self._unhashable_values > 0
+
+    def _has_pair(self, key: Any, value: Any) -> bool:
+        if not self._may_have_value(value):
+            return False
+
+        return super()._has_pair(key, value)
+
+    def _has_value(self, value: Any) -> bool:
+        try:
+            if value in self._value_counts:
+                return True
+
+        except TypeError:
+            return super()._has_value(value)
+
+        if self._unhashable_values:
+            return super()._has_value(value)
+
+        return False
+
+
+class FrozenValueIndexedMagicDict(_ValueIndexMixin[_K, _V], Generic[_K, _V]):
+    """
+    `FrozenValueIndexedMagicDict` has exactly the same functionality as
+    `FrozenMagicDict`. However, the values are indexed so checking whether
+    a value is in `dic.values()` does not scan the dictionary.
+    """
+
+    __slots__ = ("_value_counts", "_unhashable_values")
+
+    def copy(self) -> "FrozenValueIndexedMagicDict[_K, _V]":
+        return self.__class__(self)
+
+    @classmethod
+    @typing.overload
+    def fromkeys(
+        cls, keys: Iterable[_K]
+    ) -> "FrozenValueIndexedMagicDict[_K, None]":
+        ...
+
+    @classmethod
+    @typing.overload
+    def fromkeys(
+        cls, keys: Iterable[_K], value: _V
+    ) -> "FrozenValueIndexedMagicDict[_K, _V]":
+        ...
+
+    @classmethod
+    def fromkeys(  # type: ignore
+        cls, keys: Iterable[_K], value: Optional[_V] = None
+    ) -> Union[
+        "FrozenValueIndexedMagicDict[_K, None]",
+        "FrozenValueIndexedMagicDict[_K, _V]",
+    ]:
+        def _gen() -> Iterator[Tuple[_K, Optional[_V]]]:
+            for k in keys:
+                yield (k, value)
+
+        return cls(_gen())  # type: ignore
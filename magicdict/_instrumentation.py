@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#   Copyright 2021 Kaede Hoshikawa
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple, TypeVar
+import functools
+import threading
+import time
+import typing
+
+__all__ = [
+    "Instrumentation",
+    "InstrumentationSnapshot",
+    "LockStats",
+    "OperationStats",
+]
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+# The operations that are counted and timed, the ones a class does not
+# have are skipped. Looking up values and pairs with `in` scans them, they
+# are recorded as `_has_value` and `_has_pair`.
+_OPERATIONS = (
+    "__getitem__",
+    "__contains__",
+    "get_last",
+    "get_iter",
+    "get_many",
+    "get_last_many",
+    "get_list_many",
+    "count",
+    "_has_pair",
+    "_has_value",
+    "_iter_pairs",
+    "_add_one",
+    "_add_pairs",
+    "__setitem__",
+    "__delitem__",
+    "pop",
+    "popitem",
+    "clear",
+    "with_added",
+    "with_set",
+    "without",
+    "merged",
+)
+
+if hasattr(time, "perf_counter_ns"):
+    _now = time.perf_counter_ns
+
+else:  # pragma: no cover
+
+    def _now() -> int:  # Python 3.6
+        return int(time.perf_counter() * 1_000_000_000)
+
+
+# Calls that took less than `2 ** i` nanoseconds (and at least half of it)
+# are counted in bucket `i`, the last bucket counts all the slower ones.
+_BUCKETS = 32
+
+
+class OperationStats(NamedTuple):
+    """
+    The calls of an operation, see `Instrumentation.snapshot`.
+    """
+
+    calls: int
+    # Time spent in the calls. Operations returning an iterator are timed
+    # until the iterator is returned.
+    total_ns: int
+    max_ns: int
+    # Calls by latency, bucket `i` counts the calls that took less than
+    # `2 ** i` nanoseconds.
+    histogram: Tuple[int, ...]
+
+
+class LockStats(NamedTuple):
+    """
+    The usage of the locks of the dictionaries, see
+    `Instrumentation.snapshot`.
+    """
+
+    # Exclusive and shared acquisitions.
+    acquisitions: int
+    # Time spent waiting to acquire the locks.
+    wait_ns: int
+    max_wait_ns: int
+    # Time the locks were held exclusively.
+    held_ns: int
+
+
+class InstrumentationSnapshot(NamedTuple):
+    operations: Dict[str, OperationStats]
+    lock: LockStats
+
+
+class Instrumentation:
+    """
+    Counters shared by the dictionaries of an instrumented class.
+
+    Recording takes a lock of its own, the counters are exact when the
+    dictionaries are used by multiple threads.
+    """
+
+    __slots__ = ("_mutex", "_operations", "_lock_stats")
+
+    def __init__(self) -> None:
+        self._mutex = threading.Lock()
+
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Set all the counters to zero.
+        """
+        with self._mutex:
+            # Each operation has a list of its calls, total time, maximum
+            # time and histogram buckets.
+            self._operations: Dict[str, List[int]] = {}
+            # Acquisitions, wait time, maximum wait time and held time.
+            self._lock_stats = [0, 0, 0, 0]
+
+    def record(self, name: str, elapsed: int) -> None:
+        """
+        Record a call of an operation that took elapsed nanoseconds.
+        """
+        with self._mutex:
+            stats = self._operations.get(name)
+
+            if stats is None:
+                stats = self._operations[name] = [0] * (_BUCKETS + 3)
+
+            stats[0] += 1
+            stats[1] += elapsed
+
+            if elapsed > stats[2]:
+                stats[2] = elapsed
+
+            stats[3 + min(elapsed.bit_length(), _BUCKETS - 1)] += 1
+
+    def record_wait(self, elapsed: int) -> None:
+        """
+        Record an acquisition of a lock that waited elapsed nanoseconds.
+        """
+        with self._mutex:
+            stats = self._lock_stats
+
+            stats[0] += 1
+            stats[1] += elapsed
+
+            if elapsed > stats[2]:
+                stats[2] = elapsed
+
+    def record_held(self, elapsed: int) -> None:
+        """
+        Record a lock held exclusively for elapsed nanoseconds.
+        """
+        with self._mutex:
+            self._lock_stats[3] += elapsed
+
+    def snapshot(self) -> InstrumentationSnapshot:
+        """
+        Return a copy of the counters, to be exported to a metrics system.
+        """
+        with self._mutex:
+            return InstrumentationSnapshot(
+                operations={
+                    name: OperationStats(
+                        calls=stats[0],
+                        total_ns=stats[1],
+                        max_ns=stats[2],
+                        histogram=tuple(stats[3:]),
+                    )
+                    for name, stats in self._operations.items()
+                },
+                lock=LockStats(*self._lock_stats),
+            )
+
+
+class _TimedLock:
+    """
+    Wraps the lock of a `MagicDict` to record how long it is waited for and
+    held. It supports what the guards use: `with lock:` and, for a
+    `_ReadWriteLock`, `acquire_shared` and `release_shared`.
+    """
+
+    __slots__ = ("_lock", "_instrumentation", "_acquired_at")
+
+    def __init__(self, lock: Any, instrumentation: Instrumentation) -> None:
+        self._lock = lock
+        self._instrumentation = instrumentation
+
+        self._acquired_at = 0
+
+    def __enter__(self) -> None:
+        started_at = _now()
+        self._lock.__enter__()
+
+        # Only the holder of the lock sets this.
+        self._acquired_at = acquired_at = _now()
+        self._instrumentation.record_wait(acquired_at - started_at)
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._instrumentation.record_held(_now() - self._acquired_at)
+        self._lock.__exit__(*exc_info)
+
+    def acquire_shared(self) -> None:
+        started_at = _now()
+        self._lock.acquire_shared()
+
+        self._instrumentation.record_wait(_now() - started_at)
+
+    def release_shared(self) -> None:
+        self._lock.release_shared()
+
+
+def _timed(name: str, method: _F, instrumentation: Instrumentation) -> _F:
+    @functools.wraps(method)
+    def _instrumented(*args: Any, **kwargs: Any) -> Any:
+        started_at = _now()
+
+        try:
+            return method(*args, **kwargs)
+
+        finally:
+            instrumentation.record(name, _now() - started_at)
+
+    # The guards of a `MagicDict` may replace it in a subclass, which is
+    # then instrumented again.
+    _instrumented._guarded = True  # type: ignore
+    _instrumented._instrumented = True  # type: ignore
+
+    return typing.cast(_F, _instrumented)
+
+
+def _instrument(cls: Any) -> None:
+    """
+    Replace the operations of an instrumented class with versions that
+    record their calls in `cls.instrumentation`.
+    """
+    if "instrumentation" not in cls.__dict__:
+        cls.instrumentation = Instrumentation()
+
+    instrumentation = cls.instrumentation
+
+    for name in _OPERATIONS:
+        method = getattr(cls, name, None)
+
+        if method is None:
+            continue
+
+        if getattr(method, "_instrumented", False):
+            # Inherited from an instrumented class.
+            method = method.__wrapped__
+
+        setattr(cls, name, _timed(name, method, instrumentation))
+
+    make_lock = getattr(cls, "_make_lock", None)
+
+    if make_lock is not None:
+        if getattr(make_lock, "_instrumented", False):
+            make_lock = make_lock.__wrapped__
+
+        @functools.wraps(make_lock)
+        def _make_lock(self: Any) -> Any:
+            lock = make_lock(self)
+
+            return None if lock is None else _TimedLock(lock, instrumentation)
+
+        _make_lock._instrumented = True  # type: ignore
+
+        cls._make_lock = _make_lock
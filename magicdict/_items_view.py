@@ -17,10 +17,13 @@
 
 from typing import (
     Any,
+    Callable,
     Generic,
     ItemsView,
     Iterable,
     Iterator,
+    List,
+    Optional,
     Reversible,
     Set,
     Tuple,
@@ -29,6 +32,7 @@ from typing import (
 )
 import collections
 import collections.abc
+import itertools
 import typing
 
 if typing.TYPE_CHECKING:  # pragma: no cover
@@ -94,17 +98,19 @@ class MagicItemsView(
         return reduced_set
 
     def __iter__(self) -> Iterator[Tuple[_K, _V]]:
-        yield from self._map._kv_pairs.values()
+        return iter(self._map._iter_pairs())
 
     def __contains__(self, pair: Any) -> bool:
         try:
             k, v = pair
             k = self._map._alter_key(k)
 
-        except (AttributeError, IndexError):  # pragma: no cover
+        except (AttributeError, IndexError, TypeError):
+            # Keys that can not be altered, such as unhashable keys of the
+            # case-insensitive dictionaries, are never in the dictionary.
             return False
 
-        return (k, v) in self._map._kv_pairs.values()
+        return self._map._has_pair(k, v)
 
     def __eq__(self, obj: Any) -> bool:
         if not isinstance(obj, collections.abc.Iterable):  # pragma: no cover
@@ -134,29 +140,182 @@ class MagicItemsView(
     def __ne__(self, obj: Any) -> bool:
         return not self.__eq__(obj)
 
+    def _same_pairs(self, obj: Any) -> Optional[Set[Any]]:
+        """
+        Return the pairs of the other view as a set if it alters keys the
+        same way, the keys do not need to be altered again.
+        """
+        if (
+            isinstance(obj, MagicItemsView)
+            and obj._map._alter_key is self._map._alter_key
+        ):
+            return set(obj._map._iter_pairs())
+
+        return None
+
+    # `len` counts all the pairs, the length checks are kept as
+    # `collections.abc.Set` does them.
+
     def __lt__(self, obj: Iterable[Any]) -> bool:
+        pairs = self._same_pairs(obj)
+
+        if pairs is not None:
+            return len(self) < len(pairs) and pairs.issuperset(
+                self._map._iter_pairs()
+            )
+
         return super().__lt__(self._maybe_alter_keys(obj))
 
     def __le__(self, obj: Iterable[Any]) -> bool:
+        pairs = self._same_pairs(obj)
+
+        if pairs is not None:
+            return len(self) <= len(pairs) and pairs.issuperset(
+                self._map._iter_pairs()
+            )
+
         return super().__le__(self._maybe_alter_keys(obj))
 
     def __gt__(self, obj: Iterable[Any]) -> bool:
+        pairs = self._same_pairs(obj)
+
+        if pairs is not None:
+            return len(self) > len(pairs) and pairs.issubset(
+                self._map._iter_pairs()
+            )
+
         return super().__gt__(self._maybe_alter_keys(obj))
 
     def __ge__(self, obj: Iterable[Any]) -> bool:
+        pairs = self._same_pairs(obj)
+
+        if pairs is not None:
+            return len(self) >= len(pairs) and pairs.issubset(
+                self._map._iter_pairs()
+            )
+
         return super().__ge__(self._maybe_alter_keys(obj))
 
     def __and__(self, obj: Iterable[Any]) -> Set[Tuple[_K, _V]]:
+        pairs = self._same_pairs(obj)
+
+        if pairs is not None:
+            return pairs.intersection(self._map._iter_pairs())
+
         return super().__and__(self._alter_keys_reduced(obj))
 
     def __or__(self, obj: Iterable[_T]) -> Set[Union[Tuple[_K, _V], _T]]:
+        pairs = self._same_pairs(obj)
+
+        if pairs is not None:
+            return pairs.union(self._map._iter_pairs())
+
         return super().__or__(self._maybe_alter_keys(obj))
 
     def __sub__(self, obj: Iterable[Any]) -> Set[Tuple[_K, _V]]:
+        pairs = self._same_pairs(obj)
+
+        if pairs is not None:
+            return set(self._map._iter_pairs()).difference(pairs)
+
         return super().__sub__(self._alter_keys_reduced(obj))
 
     def __xor__(self, obj: Iterable[_T]) -> Set[Union[Tuple[_K, _V], _T]]:
+        pairs = self._same_pairs(obj)
+
+        if pairs is not None:
+            return pairs.symmetric_difference(self._map._iter_pairs())
+
         return super().__xor__(self._maybe_alter_keys(obj))
 
+    def _other_has_pair(
+        self, obj: Iterable[Any]
+    ) -> Callable[[Tuple[Any, Any]], bool]:
+        if (
+            isinstance(obj, MagicItemsView)
+            and obj._map._alter_key is self._map._alter_key
+        ):
+            has_pair = obj._map._has_pair
+
+        else:
+            # Values may not be hashable, the pairs are looked up in a
+            # temporary dictionary instead of a set.
+            has_pair = self._map._from_pairs(
+                self._ordered_pairs(obj)
+            )._has_pair
+
+        return lambda pair: has_pair(*pair)
+
+    def _ordered_pairs(self, obj: Iterable[Any]) -> List[Tuple[Any, Any]]:
+        if (
+            isinstance(obj, MagicItemsView)
+            and obj._map._alter_key is self._map._alter_key
+        ):
+            return list(obj._map._iter_pairs())
+
+        alter_key = self._map._alter_key
+
+        return [(alter_key(k), v) for k, v in obj]
+
+    def _self_has_pair(self, pair: Tuple[Any, Any]) -> bool:
+        return self._map._has_pair(*pair)
+
+    # The set operations below keep the order and the duplicates of the
+    # pairs: they return a new dictionary with the pairs of this view first,
+    # then the pairs only found in the other iterable.
+
+    def intersection(self, obj: Iterable[Any]) -> "FrozenMagicDict[_K, _V]":
+        """
+        Return a dictionary with the pairs that are also in the iterable.
+        """
+        return self._map._from_pairs(
+            filter(self._other_has_pair(obj), self._map._iter_pairs())
+        )
+
+    def difference(self, obj: Iterable[Any]) -> "FrozenMagicDict[_K, _V]":
+        """
+        Return a dictionary with the pairs that are not in the iterable.
+        """
+        return self._map._from_pairs(
+            itertools.filterfalse(
+                self._other_has_pair(obj), self._map._iter_pairs()
+            )
+        )
+
+    def union(self, obj: Iterable[Tuple[_K, _V]]) -> "FrozenMagicDict[_K, _V]":
+        """
+        Return a dictionary with the pairs of this view followed by the
+        pairs of the iterable that are not in this view.
+        """
+        return self._map._from_pairs(
+            itertools.chain(
+                self._map._iter_pairs(),
+                itertools.filterfalse(
+                    self._self_has_pair, self._ordered_pairs(obj)
+                ),
+            )
+        )
+
+    def symmetric_difference(
+        self, obj: Iterable[Tuple[_K, _V]]
+    ) -> "FrozenMagicDict[_K, _V]":
+        """
+        Return a dictionary with the pairs that are either in this view or
+        in the iterable but not in both.
+        """
+        if not isinstance(obj, MagicItemsView):
+            obj = list(obj)
+
+        self_pairs = itertools.filterfalse(
+            self._other_has_pair(obj), self._map._iter_pairs()
+        )
+        other_pairs = list(
+            itertools.filterfalse(
+                self._self_has_pair, self._ordered_pairs(obj)
+            )
+        )
+
+        return self._map._from_pairs(itertools.chain(self_pairs, other_pairs))
+
     def __reversed__(self) -> Iterator[Tuple[_K, _V]]:
-        yield from reversed(self._map._kv_pairs.values())
+        return iter(self._map._reversed_pairs())
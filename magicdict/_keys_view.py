@@ -17,10 +17,13 @@
 
 from typing import (
     Any,
+    Container,
+    Dict,
     Generic,
     Iterable,
     Iterator,
     KeysView,
+    Optional,
     Reversible,
     Set,
     TypeVar,
@@ -29,6 +32,7 @@ from typing import (
 import collections
 import collections.abc
 import contextlib
+import itertools
 import typing
 
 if typing.TYPE_CHECKING:  # pragma: no cover
@@ -75,7 +79,7 @@ class MagicKeysView(KeysView[_K], Reversible[_K], Generic[_K]):
         return reduced_set
 
     def __contains__(self, key: Any) -> bool:
-        return self._map._maybe_alter_key(key) in self._map._pair_ids
+        return key in self._map
 
     def __eq__(self, obj: Any) -> bool:
         if not isinstance(obj, collections.abc.Iterable):  # pragma: no cover
@@ -105,30 +109,189 @@ class MagicKeysView(KeysView[_K], Reversible[_K], Generic[_K]):
     def __ne__(self, obj: Any) -> bool:
         return not self.__eq__(obj)
 
+    def _same_keys(self, obj: Any) -> Optional[KeysView[Any]]:
+        """
+        Return the keys of the index of the other view if it alters keys
+        the same way, so set operations can run on both indexes directly.
+        """
+        if (
+            isinstance(obj, MagicKeysView)
+            and obj._map._alter_key is self._map._alter_key
+        ):
+            return obj._map._pair_ids.keys()
+
+        return None
+
+    # `len` counts the keys of all the pairs, the length checks are kept as
+    # `collections.abc.Set` does them.
+
     def __lt__(self, obj: Iterable[Any]) -> bool:
+        keys = self._same_keys(obj)
+
+        if keys is not None:
+            return len(self) < len(keys) and self._map._pair_ids.keys() <= keys
+
         return super().__lt__(self._maybe_alter_keys(obj))
 
     def __le__(self, obj: Iterable[Any]) -> bool:
+        keys = self._same_keys(obj)
+
+        if keys is not None:
+            return (
+                len(self) <= len(keys) and self._map._pair_ids.keys() <= keys
+            )
+
         return super().__le__(self._maybe_alter_keys(obj))
 
     def __gt__(self, obj: Iterable[Any]) -> bool:
+        keys = self._same_keys(obj)
+
+        if keys is not None:
+            return len(self) > len(keys) and self._map._pair_ids.keys() >= keys
+
         return super().__gt__(self._maybe_alter_keys(obj))
 
     def __ge__(self, obj: Iterable[Any]) -> bool:
+        keys = self._same_keys(obj)
+
+        if keys is not None:
+            return (
+                len(self) >= len(keys) and self._map._pair_ids.keys() >= keys
+            )
+
         return super().__ge__(self._maybe_alter_keys(obj))
 
     def __and__(self, obj: Iterable[Any]) -> Set[_K]:
+        keys = self._same_keys(obj)
+
+        if keys is not None:
+            return self._map._pair_ids.keys() & keys
+
         return super().__and__(self._alter_keys_reduced(obj))
 
     def __or__(self, obj: Iterable[_T]) -> Set[Union[_K, _T]]:
+        keys = self._same_keys(obj)
+
+        if keys is not None:
+            return self._map._pair_ids.keys() | keys
+
         return super().__or__(self._maybe_alter_keys(obj))
 
     def __sub__(self, obj: Iterable[Any]) -> Set[_K]:
+        keys = self._same_keys(obj)
+
+        if keys is not None:
+            return self._map._pair_ids.keys() - keys
+
         return super().__sub__(self._alter_keys_reduced(obj))
 
     def __xor__(self, obj: Iterable[_T]) -> Set[Union[_K, _T]]:
+        keys = self._same_keys(obj)
+
+        if keys is not None:
+            return self._map._pair_ids.keys() ^ keys
+
         return super().__xor__(self._maybe_alter_keys(obj))
 
+    def _ordered_keys(self, obj: Iterable[_T]) -> Iterator[Any]:
+        if self._same_keys(obj) is not None:
+            return iter(typing.cast("MagicKeysView[Any]", obj)._map)
+
+        return self._maybe_alter_keys_ordered(obj)
+
+    def _maybe_alter_keys_ordered(self, obj: Iterable[_T]) -> Iterator[Any]:
+        for i in obj:
+            with contextlib.suppress(AttributeError, TypeError):
+                i = self._map._maybe_alter_key(i)
+
+            yield i
+
+    # The set operations below return the keys in order, as the keys of a
+    # dict: the keys of this view come first, in the order they are first
+    # seen, then the keys only found in the other iterable.
+
+    def intersection(self, obj: Iterable[Any]) -> KeysView[_K]:
+        """
+        Return the keys that are also in the iterable, in order.
+        """
+        keys: Optional[Container[Any]] = self._same_keys(obj)
+
+        if keys is None:
+            keys = self._alter_keys_reduced(obj)
+
+        return dict.fromkeys(filter(keys.__contains__, self._map)).keys()
+
+    def difference(self, obj: Iterable[Any]) -> KeysView[_K]:
+        """
+        Return the keys that are not in the iterable, in order.
+        """
+        keys: Optional[Container[Any]] = self._same_keys(obj)
+
+        if keys is None:
+            keys = self._alter_keys_reduced(obj)
+
+        return dict.fromkeys(
+            itertools.filterfalse(keys.__contains__, self._map)
+        ).keys()
+
+    def union(self, obj: Iterable[_T]) -> KeysView[Union[_K, _T]]:
+        """
+        Return the keys of this view and the iterable, in order.
+        """
+        keys: Dict[Any, None] = dict.fromkeys(self._map)
+        keys.update(dict.fromkeys(self._ordered_keys(obj)))
+
+        return keys.keys()
+
+    def symmetric_difference(
+        self, obj: Iterable[_T]
+    ) -> KeysView[Union[_K, _T]]:
+        """
+        Return the keys that are either in this view or in the iterable but
+        not in both, in order.
+        """
+        self_keys: Dict[Any, None] = dict.fromkeys(self._map)
+        other_keys = dict.fromkeys(self._ordered_keys(obj))
+
+        keys = dict.fromkeys(
+            itertools.filterfalse(other_keys.__contains__, self_keys)
+        )
+        keys.update(
+            dict.fromkeys(
+                itertools.filterfalse(self_keys.__contains__, other_keys)
+            )
+        )
+
+        return keys.keys()
+
+    def __iter__(self) -> Iterator[_K]:
+        return iter(self._map)
+
     def __reversed__(self) -> Iterator[_K]:
-        for key, _ in reversed(self._map._kv_pairs.values()):
-            yield key
+        return reversed(self._map)
+
+
+class _UniqueKeysView(KeysView[_K], Generic[_K]):
+    """
+    The distinct keys of a dictionary, see `FrozenMagicDict.unique_keys`.
+
+    The index of the keys is looked up on each call, as copying or
+    compacting the storage replaces it.
+    """
+
+    __slots__ = ("_map",)
+
+    def __init__(self, __map: "FrozenMagicDict[_K, Any]") -> None:
+        self._map = __map
+
+        super().__init__(self._map)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._map
+
+    def __iter__(self) -> Iterator[_K]:
+        # Listing the keys is atomic, the index may change while iterating.
+        return iter(list(self._map._pair_ids))
+
+    def __len__(self) -> int:
+        return len(self._map._pair_ids)
@@ -74,4 +74,4 @@ class TolerantMagicDict(
             for k in keys:
                 yield (k, value)
 
-        return cls(_gen())
+        return cls(_gen())  # type: ignore
@@ -16,6 +16,7 @@
 #   limitations under the License.
 
 from typing import Any, Generic, Iterator, TypeVar, ValuesView
+import operator
 import typing
 
 if typing.TYPE_CHECKING:  # pragma: no cover
@@ -37,12 +38,10 @@ class MagicValuesView(ValuesView[_V], Generic[_V]):
         super().__init__(self._map)
 
     def __iter__(self) -> Iterator[_V]:
-        for _, value in self._map._kv_pairs.values():
-            yield value
+        return map(operator.itemgetter(1), self._map._iter_pairs())
 
     def __contains__(self, value: Any) -> bool:
         return self._map._has_value(value)
 
     def __reversed__(self) -> Iterator[_V]:
-        for _, value in reversed(self._map._kv_pairs.values()):
-            yield value
+        return map(operator.itemgetter(1), self._map._reversed_pairs())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#   Copyright 2018 Kaede Hoshikawa
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+
+import asyncio
+import pickle
+
+from magicdict import AsyncMagicDict
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+
+    try:
+        return loop.run_until_complete(coro)
+
+    finally:
+        loop.close()
+
+
+class AsyncMagicDictTestCase:
+    def test_wait_for(self):
+        async def _test():
+            dic = AsyncMagicDict([("a", "b")])
+
+            assert await dic.wait_for("a") == "b"
+
+            waiter = asyncio.ensure_future(dic.wait_for("c"))
+            await asyncio.sleep(0)
+            assert not waiter.done()
+
+            dic.add("c", "d")
+            dic.add("c", "e")
+
+            assert await waiter == "d"
+            assert not dic._watchers
+
+        _run(_test())
+
+    def test_wait_for_setitem_update(self):
+        async def _test():
+            dic = AsyncMagicDict()
+
+            waiters = [
+                asyncio.ensure_future(dic.wait_for(key)) for key in "abc"
+            ]
+            await asyncio.sleep(0)
+
+            dic["a"] = "d"
+            dic.update([("b", "e")])
+            dic.update(AsyncMagicDict(c="f"))
+
+            assert await asyncio.gather(*waiters) == ["d", "e", "f"]
+
+        _run(_test())
+
+    def test_wait_for_cancelled(self):
+        async def _test():
+            dic = AsyncMagicDict()
+
+            waiter = asyncio.ensure_future(dic.wait_for("a"))
+            await asyncio.sleep(0)
+
+            waiter.cancel()
+            await asyncio.sleep(0)
+
+            assert not dic._watchers
+
+        _run(_test())
+
+    def test_get_aiter(self):
+        async def _test():
+            dic = AsyncMagicDict([("a", "b"), ("c", "d")])
+            values = []
+
+            async def _consume():
+                async for value in dic.get_aiter("a"):
+                    values.append(value)
+
+                    if len(values) == 3:
+                        break
+
+            consumer = asyncio.ensure_future(_consume())
+            await asyncio.sleep(0)
+
+            dic.add("c", "e")
+            dic.add("a", "f")
+            dic.update(a="g")
+
+            await consumer
+
+            assert values == ["b", "f", "g"]
+
+        _run(_test())
+
+    def test_copy(self):
+        dic = AsyncMagicDict([("a", "b")])
+        dic_copy = dic.copy()
+
+        dic_copy.add("a", "c")
+
+        assert isinstance(dic_copy, AsyncMagicDict)
+        assert dic.get_list("a") == ["b"]
+        assert dic_copy.get_list("a") == ["b", "c"]
+
+    def test_pickle(self):
+        async def _test():
+            dic = pickle.loads(pickle.dumps(AsyncMagicDict([("a", "b")])))
+
+            waiter = asyncio.ensure_future(dic.wait_for("c"))
+            await asyncio.sleep(0)
+
+            dic.add("c", "d")
+
+            assert await waiter == "d"
+
+        _run(_test())
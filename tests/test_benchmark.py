@@ -0,0 +1,581 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#   Copyright 2021 Kaede Hoshikawa
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+# Benchmarks are run once as plain tests by default, use
+# `pytest --benchmark-enable tests/test_benchmark.py` to collect timings and
+# add `-m large` to run with 1M pairs.
+
+import pickle
+import threading
+import tracemalloc
+
+import pytest
+
+from magicdict import (
+    CompactMagicDict,
+    Concurrency,
+    FrozenFingerprintedMagicDict,
+    FrozenMagicDict,
+    FrozenSharedMagicDict,
+    FrozenTolerantMagicDict,
+    FrozenValueIndexedMagicDict,
+    MagicDict,
+    TolerantMagicDict,
+)
+
+_SIZES = [10, 1_000, pytest.param(1_000_000, marks=pytest.mark.large)]
+
+_VALUES_PER_KEY = [1, 50]
+
+
+_READERS = 4
+
+_READS_PER_WRITE = 20
+
+
+def _make_pairs(size, values_per_key, upper=False):
+    key_count = max(size // values_per_key, 1)
+    key_fmt = "X-Header-{}" if upper else "x-header-{}"
+
+    return [
+        (key_fmt.format(i % key_count), "value-{}".format(i))
+        for i in range(size)
+    ]
+
+
+@pytest.fixture(params=_SIZES, ids=lambda size: "size={}".format(size))
+def size(request):
+    return request.param
+
+
+@pytest.fixture(
+    params=_VALUES_PER_KEY, ids=lambda vpk: "values_per_key={}".format(vpk)
+)
+def values_per_key(request):
+    return request.param
+
+
+@pytest.fixture
+def pairs(size, values_per_key):
+    return _make_pairs(size, values_per_key)
+
+
+@pytest.fixture
+def keys(pairs):
+    return list(dict.fromkeys(k for k, _ in pairs))
+
+
+@pytest.fixture
+def frozen_dic(pairs):
+    return FrozenMagicDict(pairs)
+
+
+class ConstructionBenchmarkTestCase:
+    @pytest.mark.benchmark(group="init")
+    def test_frozen_init(self, benchmark, pairs):
+        dic = benchmark(FrozenMagicDict, pairs)
+
+        assert len(dic) == len(pairs)
+
+    @pytest.mark.benchmark(group="init-small")
+    @pytest.mark.parametrize("small_size", [1, 2, 4, 8, 16, 32])
+    def test_frozen_init_small(self, benchmark, small_size):
+        sample = _make_pairs(small_size, 1)
+        lookups = [sample[0][0], sample[-1][0], "x-header-missing"]
+
+        def _init_and_get():
+            dic = FrozenMagicDict(sample)
+
+            return [dic.get(key) for key in lookups]
+
+        assert benchmark(_init_and_get)[0] == sample[0][1]
+
+    @pytest.mark.benchmark(group="init")
+    def test_init(self, benchmark, pairs):
+        dic = benchmark(MagicDict, pairs)
+
+        assert len(dic) == len(pairs)
+
+    @pytest.mark.benchmark(group="init")
+    def test_init_from_magic_dict(self, benchmark, frozen_dic):
+        dic = benchmark(MagicDict, frozen_dic)
+
+        assert len(dic) == len(frozen_dic)
+
+    @pytest.mark.benchmark(group="init")
+    def test_init_from_dict(self, benchmark, pairs):
+        sample = dict(pairs)
+        dic = benchmark(MagicDict, sample)
+
+        assert len(dic) == len(sample)
+
+    @pytest.mark.benchmark(group="add")
+    def test_add(self, benchmark, pairs):
+        def _add_all():
+            dic = MagicDict()
+
+            for k, v in pairs:
+                dic.add(k, v)
+
+            return dic
+
+        dic = benchmark(_add_all)
+
+        assert len(dic) == len(pairs)
+
+    @pytest.mark.benchmark(group="add")
+    def test_update(self, benchmark, pairs):
+        def _update():
+            dic = MagicDict()
+            dic.update(pairs)
+
+            return dic
+
+        dic = benchmark(_update)
+
+        assert len(dic) == len(pairs)
+
+    @pytest.mark.benchmark(group="copy")
+    def test_frozen_copy(self, benchmark, frozen_dic):
+        assert benchmark(frozen_dic.copy) == frozen_dic
+
+    @pytest.mark.benchmark(group="copy")
+    def test_copy(self, benchmark, pairs):
+        dic = MagicDict(pairs)
+
+        assert benchmark(dic.copy) == dic
+
+    @pytest.mark.benchmark(group="pickle")
+    def test_pickle_dumps(self, benchmark, frozen_dic):
+        assert benchmark(pickle.dumps, frozen_dic, pickle.HIGHEST_PROTOCOL)
+
+    @pytest.mark.benchmark(group="pickle")
+    def test_pickle_loads(self, benchmark, pairs):
+        data = pickle.dumps(MagicDict(pairs), pickle.HIGHEST_PROTOCOL)
+        dic = benchmark(pickle.loads, data)
+
+        assert len(dic) == len(pairs)
+
+    @pytest.mark.benchmark(group="pickle")
+    def test_pickle_loads_compact(self, benchmark, pairs):
+        data = pickle.dumps(CompactMagicDict(pairs), pickle.HIGHEST_PROTOCOL)
+        dic = benchmark(pickle.loads, data)
+
+        assert len(dic) == len(pairs)
+
+
+class PersistentBenchmarkTestCase:
+    @pytest.mark.benchmark(group="persistent")
+    def test_with_added(self, benchmark, frozen_dic):
+        dic = benchmark(frozen_dic.with_added, "x-new-header", "value")
+
+        assert len(dic) == len(frozen_dic) + 1
+
+    @pytest.mark.benchmark(group="persistent")
+    def test_with_set(self, benchmark, frozen_dic, keys):
+        benchmark(frozen_dic.with_set, keys[0], "value")
+
+    @pytest.mark.benchmark(group="persistent")
+    def test_without(self, benchmark, frozen_dic, keys):
+        benchmark(frozen_dic.without, keys[0])
+
+
+class LookupBenchmarkTestCase:
+    @pytest.mark.benchmark(group="getitem")
+    def test_getitem(self, benchmark, frozen_dic, keys):
+        def _getitem_all():
+            for k in keys:
+                frozen_dic[k]
+
+        benchmark(_getitem_all)
+
+    @pytest.mark.benchmark(group="getitem")
+    def test_getitem_shared(self, benchmark, frozen_dic, keys):
+        dic = FrozenSharedMagicDict(frozen_dic)
+
+        def _getitem_all():
+            for k in keys:
+                dic[k]
+
+        benchmark(_getitem_all)
+
+        dic.close()
+        dic.unlink()
+
+    @pytest.mark.benchmark(group="getitem")
+    def test_get_last(self, benchmark, frozen_dic, keys):
+        def _get_last_all():
+            for k in keys:
+                frozen_dic.get_last(k)
+
+        benchmark(_get_last_all)
+
+    @pytest.mark.benchmark(group="getitem")
+    def test_get_many(self, benchmark, frozen_dic, keys):
+        values = benchmark(frozen_dic.get_many, keys)
+
+        assert len(values) == len(keys)
+
+    @pytest.mark.benchmark(group="getitem")
+    def test_contains(self, benchmark, frozen_dic, keys):
+        def _contains_all():
+            for k in keys:
+                k in frozen_dic  # noqa: B015
+
+        benchmark(_contains_all)
+
+    @pytest.mark.benchmark(group="count")
+    def test_count(self, benchmark, frozen_dic, keys):
+        def _count_all():
+            return [frozen_dic.count(k) for k in keys]
+
+        assert sum(benchmark(_count_all)) == len(frozen_dic)
+
+    @pytest.mark.benchmark(group="count")
+    def test_count_with_get_list(self, benchmark, frozen_dic, keys):
+        def _count_all():
+            return [len(frozen_dic.get_list(k)) for k in keys]
+
+        assert sum(benchmark(_count_all)) == len(frozen_dic)
+
+    @pytest.mark.benchmark(group="get_iter")
+    def test_get_iter(self, benchmark, frozen_dic, keys):
+        def _get_iter_all():
+            for k in keys:
+                for _ in frozen_dic.get_iter(k):
+                    pass
+
+        benchmark(_get_iter_all)
+
+    @pytest.mark.benchmark(group="get_iter")
+    def test_get_list(self, benchmark, frozen_dic, keys):
+        def _get_list_all():
+            for k in keys:
+                frozen_dic.get_list(k)
+
+        benchmark(_get_list_all)
+
+    @pytest.mark.benchmark(group="get_iter")
+    def test_get_list_many(self, benchmark, frozen_dic, keys):
+        value_lists = benchmark(frozen_dic.get_list_many, keys)
+
+        assert sum(map(len, value_lists)) == len(frozen_dic)
+
+
+class MutationBenchmarkTestCase:
+    @pytest.mark.benchmark(group="setitem")
+    def test_setitem(self, benchmark, pairs, keys):
+        def _setup():
+            return (MagicDict(pairs),), {}
+
+        def _setitem_all(dic):
+            for k in keys:
+                dic[k] = "new-value"
+
+        benchmark.pedantic(_setitem_all, setup=_setup, rounds=10)
+
+    @pytest.mark.benchmark(group="setitem")
+    def test_delitem(self, benchmark, pairs, keys):
+        def _setup():
+            return (MagicDict(pairs),), {}
+
+        def _delitem_all(dic):
+            for k in keys:
+                del dic[k]
+
+            assert len(dic) == 0
+
+        benchmark.pedantic(_delitem_all, setup=_setup, rounds=10)
+
+    @pytest.mark.benchmark(group="pop")
+    def test_pop(self, benchmark, pairs, keys):
+        def _setup():
+            return (MagicDict(pairs),), {}
+
+        def _pop_all(dic):
+            for k in keys:
+                while dic.pop(k, None) is not None:
+                    pass
+
+            assert len(dic) == 0
+
+        benchmark.pedantic(_pop_all, setup=_setup, rounds=10)
+
+    @pytest.mark.benchmark(group="pop")
+    def test_popitem(self, benchmark, pairs):
+        def _setup():
+            return (MagicDict(pairs),), {}
+
+        def _popitem_all(dic):
+            for _ in range(len(dic)):
+                dic.popitem()
+
+        benchmark.pedantic(_popitem_all, setup=_setup, rounds=10)
+
+    @pytest.mark.benchmark(group="pop")
+    def test_popitem_fifo(self, benchmark, pairs):
+        def _setup():
+            return (MagicDict(pairs),), {}
+
+        def _popitem_all(dic):
+            for _ in range(len(dic)):
+                dic.popitem(last=False)
+
+        benchmark.pedantic(_popitem_all, setup=_setup, rounds=10)
+
+
+class ViewBenchmarkTestCase:
+    @pytest.mark.benchmark(group="iter")
+    def test_iter(self, benchmark, frozen_dic):
+        assert len(benchmark(list, frozen_dic)) == len(frozen_dic)
+
+    @pytest.mark.benchmark(group="iter")
+    def test_keys_iter(self, benchmark, frozen_dic):
+        assert len(benchmark(list, frozen_dic.keys())) == len(frozen_dic)
+
+    @pytest.mark.benchmark(group="iter")
+    def test_values_iter(self, benchmark, frozen_dic):
+        assert len(benchmark(list, frozen_dic.values())) == len(frozen_dic)
+
+    @pytest.mark.benchmark(group="iter")
+    def test_items_iter(self, benchmark, frozen_dic):
+        assert len(benchmark(list, frozen_dic.items())) == len(frozen_dic)
+
+    @pytest.mark.benchmark(group="iter")
+    def test_items_reversed(self, benchmark, frozen_dic):
+        def _reversed_items():
+            return list(reversed(frozen_dic.items()))
+
+        assert len(benchmark(_reversed_items)) == len(frozen_dic)
+
+    @pytest.mark.benchmark(group="contains")
+    def test_items_contains(self, benchmark, frozen_dic, pairs):
+        pair = pairs[-1]
+
+        assert benchmark(frozen_dic.items().__contains__, pair)
+
+    @pytest.mark.benchmark(group="contains")
+    def test_values_contains(self, benchmark, frozen_dic, pairs):
+        _, value = pairs[-1]
+
+        assert benchmark(frozen_dic.values().__contains__, value)
+
+    @pytest.mark.benchmark(group="contains")
+    def test_values_contains_indexed(self, benchmark, pairs):
+        dic = FrozenValueIndexedMagicDict(pairs)
+        _, value = pairs[-1]
+
+        assert benchmark(dic.values().__contains__, value)
+
+    @pytest.mark.benchmark(group="eq")
+    def test_eq(self, benchmark, frozen_dic, pairs):
+        other = FrozenMagicDict(pairs)
+
+        assert benchmark(frozen_dic.__eq__, other)
+
+    @pytest.mark.benchmark(group="eq")
+    def test_eq_last_differs(self, benchmark, frozen_dic, pairs):
+        other = FrozenMagicDict(pairs[:-1] + [("x-header-other", "value")])
+
+        assert not benchmark(frozen_dic.__eq__, other)
+
+    @pytest.mark.benchmark(group="eq")
+    def test_eq_fingerprinted(self, benchmark, pairs):
+        dic = FrozenFingerprintedMagicDict(pairs)
+        other = FrozenFingerprintedMagicDict(
+            pairs[:-1] + [("x-header-other", "value")]
+        )
+
+        assert not benchmark(dic.__eq__, other)
+
+    @pytest.mark.benchmark(group="hash")
+    def test_hash(self, benchmark, frozen_dic):
+        benchmark(hash, frozen_dic)
+
+    @pytest.mark.benchmark(group="hash")
+    def test_hash_new(self, benchmark, pairs):
+        benchmark(lambda: hash(FrozenMagicDict(pairs)))
+
+    @pytest.mark.benchmark(group="set-ops")
+    def test_keys_and(self, benchmark, frozen_dic, pairs):
+        other = FrozenMagicDict(pairs[: len(pairs) // 2])
+
+        benchmark(frozen_dic.keys().__and__, other.keys())
+
+    @pytest.mark.benchmark(group="set-ops")
+    def test_keys_or(self, benchmark, frozen_dic, pairs):
+        other = FrozenMagicDict(pairs[: len(pairs) // 2])
+
+        benchmark(frozen_dic.keys().__or__, other.keys())
+
+    @pytest.mark.benchmark(group="set-ops")
+    def test_keys_sub(self, benchmark, frozen_dic, pairs):
+        other = FrozenMagicDict(pairs[: len(pairs) // 2])
+
+        benchmark(frozen_dic.keys().__sub__, other.keys())
+
+    @pytest.mark.benchmark(group="set-ops")
+    def test_keys_xor(self, benchmark, frozen_dic, pairs):
+        other = FrozenMagicDict(pairs[: len(pairs) // 2])
+
+        benchmark(frozen_dic.keys().__xor__, other.keys())
+
+    @pytest.mark.benchmark(group="set-ops")
+    def test_keys_le(self, benchmark, frozen_dic, pairs):
+        other = FrozenMagicDict(pairs)
+
+        benchmark(frozen_dic.keys().__le__, other.keys())
+
+    @pytest.mark.benchmark(group="set-ops")
+    def test_items_and(self, benchmark, frozen_dic, pairs):
+        other = FrozenMagicDict(pairs[: len(pairs) // 2])
+
+        benchmark(frozen_dic.items().__and__, other.items())
+
+    @pytest.mark.benchmark(group="set-ops")
+    def test_items_sub(self, benchmark, frozen_dic, pairs):
+        other = FrozenMagicDict(pairs[: len(pairs) // 2])
+
+        benchmark(frozen_dic.items().__sub__, other.items())
+
+
+class TolerantBenchmarkTestCase:
+    @pytest.mark.benchmark(group="tolerant")
+    def test_frozen_init(self, benchmark, size, values_per_key):
+        pairs = _make_pairs(size, values_per_key, upper=True)
+        dic = benchmark(FrozenTolerantMagicDict, pairs)
+
+        assert len(dic) == len(pairs)
+
+    @pytest.mark.benchmark(group="tolerant")
+    def test_init(self, benchmark, size, values_per_key):
+        pairs = _make_pairs(size, values_per_key, upper=True)
+        dic = benchmark(TolerantMagicDict, pairs)
+
+        assert len(dic) == len(pairs)
+
+    @pytest.mark.benchmark(group="tolerant")
+    def test_getitem(self, benchmark, size, values_per_key):
+        dic = FrozenTolerantMagicDict(_make_pairs(size, values_per_key))
+        keys = list(
+            dict.fromkeys(
+                k for k, _ in _make_pairs(size, values_per_key, upper=True)
+            )
+        )
+
+        def _getitem_all():
+            for k in keys:
+                dic[k]
+
+        benchmark(_getitem_all)
+
+    @pytest.mark.benchmark(group="tolerant")
+    def test_get_many(self, benchmark, size, values_per_key):
+        dic = FrozenTolerantMagicDict(_make_pairs(size, values_per_key))
+        keys = list(
+            dict.fromkeys(
+                k for k, _ in _make_pairs(size, values_per_key, upper=True)
+            )
+        )
+
+        assert None not in benchmark(dic.get_many, keys)
+
+    @pytest.mark.benchmark(group="tolerant")
+    def test_keys_and(self, benchmark, size, values_per_key):
+        dic = FrozenTolerantMagicDict(_make_pairs(size, values_per_key))
+        other = FrozenTolerantMagicDict(
+            _make_pairs(size // 2, values_per_key, upper=True)
+        )
+
+        benchmark(dic.keys().__and__, other.keys())
+
+
+class ConcurrencyBenchmarkTestCase:
+    @pytest.mark.parametrize(
+        "concurrency", list(Concurrency), ids=lambda mode: mode.value
+    )
+    @pytest.mark.benchmark(group="concurrency")
+    def test_read_heavy(self, benchmark, concurrency, pairs, keys):
+        _MagicDict = type(
+            "_MagicDict", (MagicDict,), {"concurrency": concurrency}
+        )
+        dic = _MagicDict(pairs)
+        # Readers of a dictionary that is not locked must not race writers.
+        writes = 0 if concurrency is Concurrency.NONE else 10
+
+        def _read():
+            for _ in range(_READS_PER_WRITE):
+                for k in keys[:100]:
+                    dic.get(k)
+                    dic.get_last(k)
+
+                for _ in dic.get_iter(keys[0]):
+                    pass
+
+        def _write():
+            for i in range(writes):
+                dic.add("x-new-header", i)
+                dic.pop("x-new-header")
+
+        def _run():
+            threads = [threading.Thread(target=_read) for _ in range(_READERS)]
+            threads.append(threading.Thread(target=_write))
+
+            for thread in threads:
+                thread.start()
+
+            for thread in threads:
+                thread.join()
+
+        benchmark(_run)
+
+
+class MemoryBenchmarkTestCase:
+    @staticmethod
+    def _traced_size(cls, pairs):
+        keys = [k for k, _ in pairs]
+        values = [v for _, v in pairs]
+
+        tracemalloc.start()
+
+        try:
+            # Pairs are built as they would be by `add`.
+            dic = cls(zip(keys, values))
+            size, _ = tracemalloc.get_traced_memory()
+
+        finally:
+            tracemalloc.stop()
+
+        assert len(dic) == len(pairs)
+
+        return size
+
+    @pytest.mark.benchmark(group="memory")
+    def test_compact_memory(self, benchmark, pairs, values_per_key):
+        size = self._traced_size(MagicDict, pairs)
+        compact_size = self._traced_size(CompactMagicDict, pairs)
+
+        benchmark.extra_info["bytes_per_pair"] = size / len(pairs)
+        benchmark.extra_info["compact_bytes_per_pair"] = compact_size / len(
+            pairs
+        )
+
+        # Small sizes are skewed by the tuples reused from free lists.
+        if len(pairs) > 10_000 and values_per_key > 1:
+            assert compact_size * 2 <= size
+
+        benchmark(CompactMagicDict, pairs)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#   Copyright 2018 Kaede Hoshikawa
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+
+import pickle
+
+from magicdict import CompactMagicDict, FrozenCompactMagicDict, MagicDict
+
+
+class CompactMagicDictTestCase:
+    def test_setitem_delitem(self):
+        dic = CompactMagicDict([("a", "b"), ("c", "d"), ("a", "e")])
+
+        dic["a"] = "f"
+
+        assert dic.items() == [("c", "d"), ("a", "f")]
+        assert "b" not in dic.values()
+
+        del dic["c"]
+
+        assert dic.items() == [("a", "f")]
+        assert len(dic) == 1
+
+    def test_pop_popitem(self):
+        dic = CompactMagicDict([("a", "b"), ("a", "c"), ("d", "e"), (None, 1)])
+
+        assert dic.pop("a") == "c"
+        assert dic.popitem() == (None, 1)
+        assert dic.popitem(last=False) == ("a", "b")
+        assert dic.items() == [("d", "e")]
+
+    def test_popitem_fifo(self):
+        pairs = [("a" if i % 3 else "b", i) for i in range(100)]
+        dic = CompactMagicDict(pairs)
+
+        for i, pair in enumerate(pairs):
+            assert dic.popitem(last=False) == pair
+            assert dic.items() == pairs[i + 1 :]
+
+    def test_compaction(self):
+        dic = CompactMagicDict((str(i), i) for i in range(100))
+
+        for i in range(0, 90):
+            del dic[str(i)]
+
+        assert len(dic._keys) < 20
+        assert dic.items() == [(str(i), i) for i in range(90, 100)]
+        assert dic[str(95)] == 95
+
+    def test_copy_modify(self):
+        dic = CompactMagicDict([("a", "b"), ("c", "d")])
+
+        dic_copy = dic.copy()
+        dic_copy.add("a", "e")
+        frozen_dic = FrozenCompactMagicDict(dic_copy)
+        del dic_copy["c"]
+
+        assert dic.items() == [("a", "b"), ("c", "d")]
+        assert dic_copy.items() == [("a", "b"), ("a", "e")]
+        assert frozen_dic.items() == [("a", "b"), ("c", "d"), ("a", "e")]
+
+    def test_pickle(self):
+        dic = CompactMagicDict([("a", "b"), ("c", "d"), ("a", "e")])
+        del dic["c"]
+
+        loaded_dic = pickle.loads(pickle.dumps(dic))
+        loaded_dic.add("c", "f")
+
+        assert type(loaded_dic) is CompactMagicDict
+        assert loaded_dic.items() == [("a", "b"), ("a", "e"), ("c", "f")]
+        assert loaded_dic.get_last("a") == "e"
+
+    def test_update_from_magic_dict(self):
+        dic = CompactMagicDict([("a", "b")])
+        dic.update(MagicDict([("a", "c")]))
+
+        assert dic.get_list("a") == ["b", "c"]
+        assert MagicDict(dic).get_list("a") == ["b", "c"]
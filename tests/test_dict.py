@@ -15,9 +15,25 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
+import pickle
+import sys
+import threading
+
 import pytest
 
-from magicdict import MagicDict
+from magicdict import Concurrency, FrozenMagicDict, MagicDict
+from magicdict._concurrency import _ReadWriteLock
+
+
+class _NoLockMagicDict(MagicDict):
+    concurrency = Concurrency.NONE
+
+
+class _NamedMagicDict(MagicDict):
+    def __init__(self, name, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.name = name
 
 
 class MagicDictTestCase:
@@ -84,6 +100,38 @@ class MagicDictTestCase:
         assert dic.pop("a", "e") == "b"
         assert len(dic) == 0
 
+    def test_count(self):
+        dic = MagicDict([("a", "b"), ("c", "d"), ("a", "e")])
+
+        assert dic.count("a") == 2
+        assert dic.key_count() == 2
+
+        dic.pop("a")
+        dic.popitem(last=False)
+
+        assert dic.count("a") == 0
+        assert dic.count("c") == 1
+        assert dic.key_count() == 1
+        assert list(dic.unique_keys()) == ["c"]
+
+    def test_unique_keys_live(self):
+        dic = MagicDict([("a", "b"), ("c", "d"), ("e", "f")])
+        unique_keys = dic.unique_keys()
+
+        dic.copy()
+        dic["g"] = "h"
+
+        assert list(unique_keys) == ["a", "c", "e", "g"]
+
+        del dic["a"]
+        del dic["c"]
+        dic.compact()
+
+        assert list(unique_keys) == ["e", "g"]
+        assert len(unique_keys) == 2
+        assert "g" in unique_keys
+        assert "a" not in unique_keys
+
     def test_popitem(self):
         dic = MagicDict([("a", "b"), ("a", "c")])
 
@@ -97,6 +145,79 @@ class MagicDictTestCase:
 
         assert dic.popitem(False) == ("a", "b")
 
+    @pytest.mark.parametrize("size", [3, 200])
+    def test_popitem_fifo(self, size):
+        pairs = [("a" if i % 3 else "b", str(i)) for i in range(size)]
+        dic = MagicDict(pairs)
+
+        for i, pair in enumerate(pairs):
+            assert dic.popitem(last=False) == pair
+
+            rest = pairs[i + 1 :]
+            a_values = [v for k, v in rest if k == "a"]
+
+            assert len(dic) == len(rest)
+            assert dic.get("a") == (a_values[0] if a_values else None)
+            assert dic.get_last("a") == (a_values[-1] if a_values else None)
+            assert dic.get_list("a") == a_values
+
+        assert "a" not in dic
+        assert "b" not in dic
+
+    def test_popitem_fifo_interleaved(self):
+        dic = MagicDict([("a", str(i)) for i in range(100)])
+
+        for i in range(100, 300):
+            dic.add("a", str(i))
+            assert dic.popitem(last=False) == ("a", str(i - 100))
+
+            if i % 10 == 0:
+                assert dic.pop("a") == str(i)
+                dic.add("a", str(i))
+
+        assert dic.get_list("a") == [str(i) for i in range(200, 300)]
+
+    def test_setitem_many_times(self):
+        dic = MagicDict([("a", "b"), ("c", "d"), ("c", "e")])
+
+        for i in range(100):
+            dic["a"] = str(i)
+
+        assert dic.items() == [("c", "d"), ("c", "e"), ("a", "99")]
+        assert list(reversed(dic)) == ["a", "c", "c"]
+        assert dic.get_list("c") == ["d", "e"]
+        assert dic.get_last("a") == "99"
+
+    def test_setitem_churn(self):
+        dic = MagicDict((str(i), i) for i in range(100))
+
+        for i in range(10_000):
+            dic[str(i % 100)] = i
+
+        stats = dic.storage_stats()
+
+        assert stats.pairs == 100
+        assert stats.slots <= 200
+        assert stats.compactions > 0
+        assert dic[str(99)] == 9_999
+
+        dic.compact()
+
+        assert dic.storage_stats().slots == 100
+        assert dic.items() == [(str(i % 100), i) for i in range(9_900, 10_000)]
+
+    def test_compaction_threshold(self):
+        class _MagicDict(MagicDict):
+            compaction_threshold = 0.0
+
+        dic = _MagicDict([("a", "b"), ("c", "d"), ("e", "f")])
+
+        del dic["a"]
+
+        assert dic.storage_stats().removed == 0
+        assert dic.storage_stats().compactions == 1
+        assert dic.items() == [("c", "d"), ("e", "f")]
+
     def test_update(self):
         dic = MagicDict()
 
@@ -106,6 +227,31 @@ class MagicDictTestCase:
         dic.update([("a", "c")], a="d")
         assert dic.get_list("a") == ["b", "c", "d"]
 
+    def test_update_from_magic_dict(self):
+        dic = MagicDict([("a", "b")])
+        sample = MagicDict([("a", "c"), ("d", "e")])
+
+        dic.update(sample)
+        assert dic.items() == [("a", "b"), ("a", "c"), ("d", "e")]
+
+        dic.update(dic)
+        assert dic.get_list("a") == ["b", "c", "b", "c"]
+        assert len(dic) == 6
+
+        dic_copy = MagicDict(dic)
+        dic_copy.add("a", "f")
+
+        assert dic.get_list("a") == ["b", "c", "b", "c"]
+        assert dic_copy.get_last("a") == "f"
+
+    def test_update_with_lists(self):
+        dic = MagicDict([["a", "b"], ["a", "c"]])
+
+        dic.update(iter([["d", "e"]]))
+
+        assert dic.items() == [("a", "b"), ("a", "c"), ("d", "e")]
+        assert list(dic.items())[-1] == ("d", "e")
+
     def test_clear(self):
         dic = MagicDict([("a", "b"), ("a", "d"), ("a", "f")])
 
@@ -130,9 +276,253 @@ class MagicDictTestCase:
         assert dic.get_list("a") == ["d"]
         assert dic.get_list("b") == ["d", "d"]
 
+    def test_method_hash(self):
+        with pytest.raises(TypeError):
+            hash(MagicDict(a="b"))
+
     def test_copy(self):
         dic = MagicDict([("a", "b"), ("a", "d"), ("a", "f")])
 
         dic_copy = dic.copy()
 
         assert dic == dic_copy
+
+    def test_copy_modify(self):
+        dic = MagicDict([("a", "b"), ("a", "d"), ("c", "f")])
+
+        dic_copy = dic.copy()
+        dic_copy.add("a", "g")
+        del dic_copy["c"]
+
+        assert dic.items() == [("a", "b"), ("a", "d"), ("c", "f")]
+        assert dic_copy.items() == [("a", "b"), ("a", "d"), ("a", "g")]
+
+        dic_copy2 = dic.copy()
+        dic["a"] = "h"
+        dic.popitem(last=False)
+
+        assert dic.items() == [("a", "h")]
+        assert dic_copy2.items() == [("a", "b"), ("a", "d"), ("c", "f")]
+
+        assert dic_copy2.pop("a") == "d"
+        assert dic_copy2.get_list("a") == ["b"]
+
+    def test_pickle(self):
+        dic = MagicDict([("a", "b"), ("c", "d"), ("a", "e")])
+        del dic["c"]
+
+        loaded_dic = pickle.loads(pickle.dumps(dic))
+        loaded_dic.add("a", "f")
+
+        assert type(loaded_dic) is MagicDict
+        assert loaded_dic._lock is not dic._lock
+        assert loaded_dic.get_list("a") == ["b", "e", "f"]
+        assert dic.get_list("a") == ["b", "e"]
+
+    def test_pickle_concurrency(self):
+        dic = _NoLockMagicDict([("a", "b")])
+
+        loaded_dic = pickle.loads(pickle.dumps(dic))
+        loaded_dic["a"] = "c"
+
+        assert loaded_dic._lock is None
+        assert loaded_dic.items() == [("a", "c")]
+
+    def test_pickle_subclass(self):
+        dic = _NamedMagicDict("headers", [("a", "b"), ("a", "c")])
+
+        loaded_dic = pickle.loads(pickle.dumps(dic))
+        loaded_dic.add("a", "d")
+
+        assert type(loaded_dic) is _NamedMagicDict
+        assert loaded_dic.name == "headers"
+        assert loaded_dic._lock is not None
+        assert loaded_dic.get_list("a") == ["b", "c", "d"]
+
+    def test_frozen_copy(self):
+        dic = MagicDict([("a", "b"), ("a", "d")])
+
+        frozen_dic = FrozenMagicDict(dic)
+        dic.add("a", "e")
+        dic.pop("a")
+        dic.pop("a")
+
+        assert frozen_dic.get_list("a") == ["b", "d"]
+        assert dic.get_list("a") == ["b"]
+
+    def test_with_added(self):
+        dic = MagicDict([("a", "b")])
+
+        dic_added = dic.with_added("a", "c")
+        dic.add("a", "d")
+
+        assert dic_added.get_list("a") == ["b", "c"]
+        assert dic.get_list("a") == ["b", "d"]
+
+        dic_added.pop("a")
+        assert dic_added.get_list("a") == ["b"]
+        assert dic.get_list("a") == ["b", "d"]
+
+    @pytest.mark.parametrize("concurrency", list(Concurrency))
+    def test_concurrency(self, concurrency):
+        _MagicDict = type(
+            "_MagicDict", (MagicDict,), {"concurrency": concurrency}
+        )
+
+        dic = _MagicDict([("a", "b"), ("c", "d")])
+        dic.add("a", "e")
+        dic["c"] = "f"
+
+        assert dic["a"] == "b"
+        assert dic.get_last("a") == "e"
+        assert dic.get_list("a") == ["b", "e"]
+        assert ("a", "e") in dic.items()
+        assert "f" in dic.values()
+        assert dic == MagicDict([("a", "b"), ("a", "e"), ("c", "f")])
+        assert list(reversed(dic)) == ["c", "a", "a"]
+
+        assert dic.pop("a") == "e"
+        assert dic.popitem(last=False) == ("a", "b")
+
+        dic.clear()
+        assert len(dic) == 0
+
+    @pytest.mark.parametrize("concurrency", list(Concurrency))
+    def test_concurrency_get_many(self, concurrency):
+        _MagicDict = type(
+            "_MagicDict", (MagicDict,), {"concurrency": concurrency}
+        )
+
+        dic = _MagicDict([("a", "b"), ("c", "d")])
+
+        def _keys():
+            # Modifies the dictionary while the keys are consumed.
+            dic.setdefault("e", "f")
+
+            yield from ["a", "e"]
+
+        assert dic.get_many(_keys()) == ["b", "f"]
+        assert dic.get_last_many(iter(["c", "g"]), "h") == ["d", "h"]
+        assert dic.get_list_many(key for key in ["a", "c"]) == [["b"], ["d"]]
+
+    @pytest.mark.parametrize(
+        "concurrency",
+        [Concurrency.LOCK, Concurrency.READ_WRITE, Concurrency.SNAPSHOT],
+    )
+    def test_concurrency_lookups(self, concurrency):
+        _MagicDict = type(
+            "_MagicDict", (MagicDict,), {"concurrency": concurrency}
+        )
+
+        dic = _MagicDict([("k", 0)] + [(i, i) for i in range(50)])
+        errors = []
+        done = threading.Event()
+
+        def _read():
+            while not done.is_set():
+                try:
+                    dic.get_last("k")
+                    dic.get_list("k")
+                    ("k", 0) in dic.items()
+                    dic["k"]
+
+                except KeyError:
+                    pass
+
+                except Exception as e:
+                    errors.append(e)
+
+        def _write():
+            for i in range(20000):
+                dic.add("k", i)
+                dic["z"] = i
+
+                if len(dic) > 80:
+                    # Removes from the front, which compacts the storage.
+                    dic.popitem(last=False)
+
+            done.set()
+
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+        try:
+            threads = [threading.Thread(target=f) for f in (_read, _write)]
+
+            for thread in threads:
+                thread.start()
+
+            for thread in threads:
+                thread.join()
+
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        assert errors == []
+
+    def test_concurrency_snapshot(self):
+        class _MagicDict(MagicDict):
+            concurrency = Concurrency.SNAPSHOT
+
+        dic = _MagicDict([("a", "b"), ("c", "d")])
+
+        items_iter = iter(dic.items())
+        assert next(items_iter) == ("a", "b")
+        values_iter = dic.get_iter("a")
+
+        del dic["a"]
+        dic.add("a", "e")
+
+        assert list(items_iter) == [("c", "d")]
+        assert list(values_iter) == ["b"]
+        assert dic.items() == [("c", "d"), ("a", "e")]
+
+    def test_concurrency_overridden(self):
+        class _MagicDict(MagicDict):
+            concurrency = Concurrency.NONE
+
+            def __getitem__(self, key):
+                return super().__getitem__(key).upper()
+
+        class _SubMagicDict(_MagicDict):
+            concurrency = Concurrency.READ_WRITE
+
+        assert _MagicDict(a="b")["a"] == "B"
+        assert _SubMagicDict(a="b")["a"] == "B"
+
+    def test_concurrency_overridden_mode(self):
+        acquisitions = []
+
+        class _Lock(_ReadWriteLock):
+            def acquire_shared(self):
+                acquisitions.append("shared")
+
+                super().acquire_shared()
+
+            def __enter__(self):
+                acquisitions.append("exclusive")
+
+                super().__enter__()
+
+        class _MagicDict(MagicDict):
+            concurrency = Concurrency.READ_WRITE
+
+            def _make_lock(self):
+                return _Lock()
+
+            def __getitem__(self, key):
+                return super().__getitem__(key).upper()
+
+            def count(self, key):
+                return super().count(key) * 2
+
+        dic = _MagicDict(a="b")
+        acquisitions.clear()
+
+        assert dic["a"] == "B"
+        assert dic.count("a") == 2
+        assert acquisitions == ["shared", "shared"]
+
+        # The parent still guards its own dictionaries for its mode.
+        assert MagicDict(a="b")["a"] == "b"
+        assert MagicDict(a="b").count("a") == 1
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#   Copyright 2018 Kaede Hoshikawa
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import pytest
+
+from magicdict import FingerprintedMagicDict, FrozenFingerprintedMagicDict
+
+
+class FingerprintedMagicDictTestCase:
+    def test_setitem(self):
+        dic = FingerprintedMagicDict([("a", "b"), ("a", "c")])
+
+        dic["a"] = "d"
+
+        assert dic == FrozenFingerprintedMagicDict(a="d")
+        assert dic != FrozenFingerprintedMagicDict(a="b")
+
+    def test_pop(self):
+        dic = FingerprintedMagicDict([("a", "b"), ("c", ["d"]), ("a", "e")])
+
+        assert dic.pop("a") == "e"
+        assert dic.pop("c") == ["d"]
+        assert dic == FingerprintedMagicDict(a="b")
+
+    def test_popitem(self):
+        dic = FingerprintedMagicDict([("a", "b"), ("a", "c"), ("d", "e")])
+
+        dic.popitem()
+        dic.popitem(last=False)
+
+        assert dic == FingerprintedMagicDict(a="c")
+
+    def test_clear(self):
+        dic = FingerprintedMagicDict([("a", "b")])
+
+        dic.clear()
+        dic.add("c", "d")
+
+        assert dic == FingerprintedMagicDict(c="d")
+
+    def test_hash(self):
+        with pytest.raises(TypeError):
+            hash(FingerprintedMagicDict(a="b"))
+
+    def test_copy(self):
+        dic = FingerprintedMagicDict([("a", "b"), ("a", "c")])
+
+        dic_copy = dic.copy()
+        dic_copy.add("d", "e")
+
+        assert dic != dic_copy
+        assert dic == FingerprintedMagicDict([("a", "b"), ("a", "c")])
+
+    def test_copy_update_removed(self):
+        dic = FingerprintedMagicDict([("a", 1), ("b", 2), ("c", 3), ("d", 4)])
+        del dic["a"]
+        del dic["b"]
+
+        dic_copy = dic.copy()
+        dic_copy.update([("e", 5), ("f", 6)])
+
+        sample = FingerprintedMagicDict(
+            [("c", 3), ("d", 4), ("e", 5), ("f", 6)]
+        )
+
+        assert dic_copy == sample
+        assert sample == dic_copy
+        assert dic == FingerprintedMagicDict([("c", 3), ("d", 4)])
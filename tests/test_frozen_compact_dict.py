@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#   Copyright 2018 Kaede Hoshikawa
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+
+from magicdict import FrozenCompactMagicDict, FrozenMagicDict
+
+
+class FrozenCompactMagicDictTestCase:
+    def test_init_with_iter(self):
+        sample = [("a", "b"), ("c", "d"), ("c", "e"), (None, "f")]
+        dic = FrozenCompactMagicDict(sample)
+
+        assert sample == [(k, v) for k, v in dic.items()]
+        assert list(reversed(dic.items())) == sample[::-1]
+        assert dic == FrozenMagicDict(sample)
+
+    def test_lookups(self):
+        dic = FrozenCompactMagicDict([("a", "b"), ("c", "d"), ("c", "e")])
+
+        assert dic["c"] == "d"
+        assert dic.get_last("c") == "e"
+        assert dic.get_last("f") is None
+        assert dic.get_list("c") == ["d", "e"]
+        assert ("c", "e") in dic.items()
+        assert ("a", "e") not in dic.items()
+        assert "e" in dic.values()
+        assert "f" not in dic.values()
+
+    def test_get_many(self):
+        dic = FrozenCompactMagicDict([("a", "b"), ("c", "d"), ("a", "f")])
+
+        assert dic.get_many(["a", "e", "c"], "g") == ["b", "g", "d"]
+        assert dic.get_last_many(["a", "e"]) == ["f", None]
+        assert dic.get_list_many(["a", "e"]) == [["b", "f"], []]
+
+    def test_count(self):
+        dic = FrozenCompactMagicDict([("a", "b"), ("c", "d"), ("a", "f")])
+
+        assert dic.count("a") == 2
+        assert dic.key_count() == 2
+        assert dic.without("a").count("a") == 0
+
+    def test_with_set_without(self):
+        dic = FrozenCompactMagicDict([("a", "b"), (None, "d"), ("a", "c")])
+
+        dic_set = dic.with_set("a", "e")
+
+        assert dic_set.items() == [(None, "d"), ("a", "e")]
+        assert dic.items() == [("a", "b"), (None, "d"), ("a", "c")]
+
+        dic_without = dic.without(None)
+
+        assert dic_without.items() == [("a", "b"), ("a", "c")]
+        assert None not in dic_without
+        assert None not in dic_without.values()
+        assert dic.get_list(None) == ["d"]
+
+    def test_copy(self):
+        dic = FrozenCompactMagicDict([("a", "b"), ("a", "c")])
+
+        dic_copy = dic.copy()
+
+        assert isinstance(dic_copy, FrozenCompactMagicDict)
+        assert dic == dic_copy
+
+    def test_fromkeys(self):
+        dic = FrozenCompactMagicDict.fromkeys(["a", "b", "b"], "d")
+
+        assert dic.items() == [("a", "d"), ("b", "d"), ("b", "d")]
@@ -15,7 +15,12 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
-from magicdict import FrozenMagicDict
+import functools
+import pickle
+
+import pytest
+
+from magicdict import FrozenMagicDict, FrozenTolerantMagicDict, StorageStats
 
 
 class FrozenMagicDictTestCase:
@@ -74,6 +79,97 @@ class FrozenMagicDictTestCase:
         assert dic != sample_ne
         assert dic != 123
 
+        assert dic != dict(sample_dic)
+        assert dic != FrozenMagicDict(reversed(list(sample_dic.items())))
+        assert FrozenMagicDict(a="b") == FrozenTolerantMagicDict(A="b")
+        assert FrozenTolerantMagicDict(A="b") == FrozenMagicDict(a="b")
+        assert FrozenMagicDict(A="b") != FrozenTolerantMagicDict(A="b")
+        assert FrozenTolerantMagicDict(A="b") != FrozenMagicDict(A="b")
+
+    def test_method_hash(self):
+        dic = FrozenMagicDict([("a", "b"), ("c", "d"), ("a", "e")])
+
+        assert hash(dic) == hash(FrozenMagicDict(dic))
+        assert hash(dic) == hash(dic)
+        assert hash(FrozenMagicDict(a="b")) == hash(
+            FrozenTolerantMagicDict(A="b")
+        )
+        assert (
+            len({FrozenTolerantMagicDict(A="b"), FrozenMagicDict(A="b")}) == 2
+        )
+        assert (
+            len({FrozenTolerantMagicDict(A="b"), FrozenMagicDict(a="b")}) == 1
+        )
+
+        assert {dic: "f"}[FrozenMagicDict(dic)] == "f"
+        assert dic not in {FrozenMagicDict(reversed(list(dic.items()))): "f"}
+
+        @functools.lru_cache()
+        def _get_list(dic):
+            return dic.get_list("a")
+
+        assert _get_list(dic) == ["b", "e"]
+        assert _get_list(dic.copy()) == ["b", "e"]
+        assert _get_list.cache_info().hits == 1
+
+        with pytest.raises(TypeError):
+            hash(FrozenMagicDict(a=[]))
+
+    def test_method_copy(self):
+        dic = FrozenMagicDict([("a", "b"), ("a", "d")], e="f")
+
+        dic_copy = dic.copy()
+
+        assert dic == dic_copy
+        assert dic_copy.get_list("a") == ["b", "d"]
+
+        dic_updated = FrozenMagicDict(dic, a="g")
+
+        assert dic_updated.get_list("a") == ["b", "d", "g"]
+        assert dic.get_list("a") == ["b", "d"]
+
+    def test_method_with_added(self):
+        dic = FrozenMagicDict([("a", "b"), ("c", "d")])
+
+        dic_added = dic.with_added("a", "e")
+
+        assert isinstance(dic_added, FrozenMagicDict)
+        assert dic_added.items() == [("a", "b"), ("c", "d"), ("a", "e")]
+        assert dic.items() == [("a", "b"), ("c", "d")]
+
+    def test_method_with_set(self):
+        dic = FrozenMagicDict([("a", "b"), ("c", "d"), ("a", "e")])
+
+        dic_set = dic.with_set("a", "f")
+
+        assert dic_set.items() == [("c", "d"), ("a", "f")]
+        assert dic.get_list("a") == ["b", "e"]
+
+    def test_method_without(self):
+        dic = FrozenMagicDict([("a", "b"), ("c", "d"), ("a", "e")])
+
+        dic_without = dic.without("a")
+
+        assert dic_without.items() == [("c", "d")]
+        assert len(dic_without) == 1
+        assert dic.get_list("a") == ["b", "e"]
+
+        with pytest.raises(KeyError):
+            dic.without("f")
+
+        assert dic_without.with_added("a", "g").items() == [
+            ("c", "d"),
+            ("a", "g"),
+        ]
+
+    def test_method_merged(self):
+        dic = FrozenMagicDict([("a", "b")])
+
+        dic_merged = dic.merged(FrozenMagicDict([("a", "c")]), d="e")
+
+        assert dic_merged.items() == [("a", "b"), ("a", "c"), ("d", "e")]
+        assert dic.items() == [("a", "b")]
+
     def test_method_str(self):
         dic = FrozenMagicDict([("a", "b")])
 
@@ -111,9 +207,120 @@ class FrozenMagicDictTestCase:
 
         assert dic.get_list("a") == ["b", "d", "f"]
 
+    def test_get_many(self):
+        dic = FrozenMagicDict([("a", "b"), ("c", "d"), ("a", "f")])
+
+        assert dic.get_many(["a", "e", "c"]) == ["b", None, "d"]
+        assert dic.get_many(["e"], "g") == ["g"]
+        assert dic.get_last_many(["a", "e"]) == ["f", None]
+        assert dic.get_list_many(iter(["a", "e", "c"])) == [
+            ["b", "f"],
+            [],
+            ["d"],
+        ]
+
+    def test_count(self):
+        dic = FrozenMagicDict([("a", "b"), ("c", "d"), ("a", "f")])
+
+        assert dic.count("a") == 2
+        assert dic.count("e") == 0
+        assert dic.key_count() == 2
+        assert len(dic.unique_keys()) == 2
+        assert list(dic.unique_keys()) == ["a", "c"]
+        assert "c" in dic.unique_keys()
+
     def test_copy(self):
         dic = FrozenMagicDict([("a", "b"), ("a", "d"), ("a", "f")])
 
         dic_copy = dic.copy()
 
         assert dic == dic_copy
+
+    def test_pickle(self):
+        dic = FrozenMagicDict([("a", "b"), ("c", "d"), ("a", "e")])
+
+        loaded_dic = pickle.loads(pickle.dumps(dic))
+
+        assert type(loaded_dic) is FrozenMagicDict
+        assert loaded_dic.items() == [("a", "b"), ("c", "d"), ("a", "e")]
+        assert loaded_dic.get_list("a") == ["b", "e"]
+
+        dic_without = dic.without("c")
+
+        assert pickle.loads(pickle.dumps(dic_without)).items() == [
+            ("a", "b"),
+            ("a", "e"),
+        ]
+
+    def test_small_dict(self):
+        dic = FrozenMagicDict([("a", "b"), ("c", "d"), ("a", "e")])
+
+        # Looked up by scanning the pairs at first, then with the index.
+        for _ in range(FrozenMagicDict.scan_limit + 1):
+            assert dic["a"] == "b"
+            assert dic.get_last("a") == "e"
+            assert "c" in dic
+            assert "x" not in dic
+            assert dic.get_last("x") is None
+
+            with pytest.raises(KeyError):
+                dic["x"]
+
+            with pytest.raises(TypeError):
+                dic[[]]  # type: ignore
+
+        assert dic.get_list("a") == ["b", "e"]
+        assert ("c", "d") in dic.items()
+        assert dic.keys() & {"a"} == {"a"}
+
+    def test_small_dict_hash_mismatch(self):
+        class _Key:
+            # Equal to "a", but not hashed like it.
+            def __eq__(self, other):
+                return other == "a"
+
+            def __hash__(self):
+                return hash("a") + 1
+
+        dic = FrozenMagicDict([("a", "b"), ("c", "d")])
+        key = _Key()
+
+        # Not found by scanning the pairs either, like in a `dict`.
+        for _ in range(FrozenMagicDict.scan_limit + 1):
+            assert key not in dic
+            assert dic.get_last(key) is None
+
+            with pytest.raises(KeyError):
+                dic[key]
+
+    def test_init_past_index_threshold(self):
+        size = FrozenMagicDict.index_threshold + 1
+        sample = [(str(i % 3), i) for i in range(size)]
+
+        for dic in (FrozenMagicDict(iter(sample)), FrozenMagicDict(sample)):
+            assert dic.items() == sample
+            assert dic["0"] == 0
+            assert dic.get_last("1") == size - 1 - (size - 2) % 3
+            assert dic.get_list("2") == list(range(2, size, 3))
+
+    def test_storage_stats_compact(self):
+        dic = FrozenMagicDict([("a", "b"), ("c", "d"), ("c", "e"), ("f", "g")])
+
+        assert dic.storage_stats() == StorageStats(
+            pairs=4, slots=4, removed=0, keys=3, compactions=0
+        )
+
+        dic_without = dic.without("a")
+
+        assert dic_without.storage_stats() == StorageStats(
+            pairs=3, slots=4, removed=1, keys=2, compactions=0
+        )
+
+        dic_without.compact()
+
+        assert dic_without.storage_stats() == StorageStats(
+            pairs=3, slots=3, removed=0, keys=2, compactions=1
+        )
+        assert dic_without.items() == [("c", "d"), ("c", "e"), ("f", "g")]
+        assert dic_without.get_last("c") == "e"
+        assert dic.items() == [("a", "b"), ("c", "d"), ("c", "e"), ("f", "g")]
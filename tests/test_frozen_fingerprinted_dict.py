@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#   Copyright 2018 Kaede Hoshikawa
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import pickle
+
+from magicdict import FrozenFingerprintedMagicDict, FrozenMagicDict
+
+
+class FrozenFingerprintedMagicDictTestCase:
+    def test_eq(self):
+        sample = [("a", "b"), ("c", "d"), ("a", "e")]
+        dic = FrozenFingerprintedMagicDict(sample)
+
+        assert dic == FrozenFingerprintedMagicDict(sample)
+        assert dic == FrozenMagicDict(sample)
+        assert dic != FrozenFingerprintedMagicDict(sample[:2] + [("a", "f")])
+        assert dic != FrozenFingerprintedMagicDict(reversed(sample))
+
+    def test_eq_unhashable(self):
+        sample = [("a", ["b"]), ("c", "d")]
+        dic = FrozenFingerprintedMagicDict(sample)
+
+        assert dic == FrozenFingerprintedMagicDict(sample)
+        assert dic != FrozenFingerprintedMagicDict([("a", ["b"]), ("c", "e")])
+
+    def test_hash(self):
+        sample = [("a", "b"), ("c", "d"), ("a", "e")]
+
+        assert hash(FrozenFingerprintedMagicDict(sample)) == hash(
+            FrozenMagicDict(sample)
+        )
+
+    def test_with_added_without(self):
+        dic = FrozenFingerprintedMagicDict([("a", "b"), ("c", "d")])
+
+        dic_added = dic.with_added("a", "e")
+
+        assert dic_added == FrozenFingerprintedMagicDict(
+            [("a", "b"), ("c", "d"), ("a", "e")]
+        )
+        assert dic_added.without("a") == FrozenFingerprintedMagicDict(c="d")
+        assert dic.with_set("c", "f") != dic
+
+    def test_copy(self):
+        dic = FrozenFingerprintedMagicDict([("a", "b"), ("a", "c")])
+
+        assert dic.copy() == dic
+        assert type(dic.copy()) is FrozenFingerprintedMagicDict
+
+    def test_pickle(self):
+        dic = FrozenFingerprintedMagicDict([("a", "b"), ("c", "d")])
+
+        loaded_dic = pickle.loads(pickle.dumps(dic))
+
+        assert type(loaded_dic) is FrozenFingerprintedMagicDict
+        assert loaded_dic == dic
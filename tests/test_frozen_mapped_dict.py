@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#   Copyright 2018 Kaede Hoshikawa
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import pickle
+
+import pytest
+
+from magicdict import FrozenMagicDict, FrozenMappedMagicDict, MagicDict
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / "dic.magicdict"
+    FrozenMappedMagicDict.write(
+        path, MagicDict([("a", "b"), ("c", "d"), ("a", "e"), (None, "f")])
+    )
+
+    return path
+
+
+class FrozenMappedMagicDictTestCase:
+    def test_init(self, path):
+        sample = [("a", "b"), ("c", "d"), ("a", "e"), (None, "f")]
+        dic = FrozenMappedMagicDict(path)
+
+        assert list(dic.items()) == sample
+        assert list(reversed(dic.items())) == sample[::-1]
+        assert dic == FrozenMagicDict(sample)
+        assert dic.path == path
+
+        dic.close()
+
+    def test_lookups(self, path):
+        dic = FrozenMappedMagicDict(path)
+
+        assert dic["a"] == "b"
+        assert dic[None] == "f"
+        assert dic.get_first("a") == "b"
+        assert dic.get_first("g") is None
+        assert dic.get_last("a") == "e"
+        assert list(dic.get_iter("a")) == ["b", "e"]
+        assert list(dic.get_iter("g")) == []
+        assert "c" in dic.keys()
+        assert "g" not in dic
+        assert ("a", "e") in dic.items()
+
+        with pytest.raises(KeyError):
+            dic["g"]
+
+    def test_write_stream(self, tmp_path):
+        path = tmp_path / "dic.magicdict"
+
+        FrozenMappedMagicDict.write(
+            path, (("key-{}".format(i % 10), i) for i in range(1000))
+        )
+        dic = FrozenMappedMagicDict(path)
+
+        assert len(dic) == 1000
+        assert len(dic.keys() & {"key-0", "key-10"}) == 1
+        assert dic.get_list("key-3") == list(range(3, 1000, 10))
+
+    def test_pickle(self, path):
+        dic = FrozenMappedMagicDict(path)
+        loaded_dic = pickle.loads(pickle.dumps(dic))
+
+        assert type(loaded_dic) is FrozenMappedMagicDict
+        assert loaded_dic.get_list("a") == ["b", "e"]
+
+    def test_derive(self, path):
+        dic = FrozenMappedMagicDict(path)
+        dic_set = dic.with_set("a", "g")
+
+        assert type(dic_set) is FrozenMagicDict
+        assert dic_set.items() == [("c", "d"), (None, "f"), ("a", "g")]
+        assert dic.get_list("a") == ["b", "e"]
+
+    def test_fromkeys(self, tmp_path):
+        with pytest.raises(TypeError, match="FrozenMappedMagicDict.write"):
+            FrozenMappedMagicDict.fromkeys(["a", "b"])
+
+        path = tmp_path / "dic.magicdict"
+        FrozenMappedMagicDict.write(path, ((key, None) for key in "ab"))
+
+        assert FrozenMappedMagicDict(path).items() == [
+            ("a", None),
+            ("b", None),
+        ]
+
+    def test_not_a_table(self, tmp_path):
+        path = tmp_path / "dic.magicdict"
+        path.write_bytes(bytes(128))
+
+        with pytest.raises(ValueError):
+            FrozenMappedMagicDict(path)
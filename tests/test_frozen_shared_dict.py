@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#   Copyright 2021 Kaede Hoshikawa
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+
+import multiprocessing
+import pickle
+import subprocess
+import sys
+import time
+
+import pytest
+
+from magicdict import FrozenMagicDict, FrozenSharedMagicDict
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (3, 8),
+    reason="FrozenSharedMagicDict requires Python 3.8 or later.",
+)
+
+
+def _get_list(dic, key):
+    return dic.get_list(key)
+
+
+@pytest.fixture
+def dic():
+    dic = FrozenSharedMagicDict([("a", "b"), ("c", "d"), ("a", "e"), (1, [2])])
+
+    yield dic
+
+    dic.close()
+    dic.unlink()
+
+
+class FrozenSharedMagicDictTestCase:
+    def test_init(self, dic):
+        sample = [("a", "b"), ("c", "d"), ("a", "e"), (1, [2])]
+
+        assert list(dic.items()) == sample
+        assert list(reversed(dic.items())) == sample[::-1]
+        assert list(dic) == ["a", "c", "a", 1]
+        assert len(dic) == 4
+        assert dic == FrozenMagicDict(sample)
+
+    def test_lookups(self, dic):
+        assert dic["a"] == "b"
+        assert dic[1] == [2]
+        assert dic.get_last("a") == "e"
+        assert dic.get_last("f") is None
+        assert dic.get_list("a") == ["b", "e"]
+        assert dic.get_list("f") == []
+        assert "c" in dic
+        assert "f" not in dic
+        assert ("a", "e") in dic.items()
+        assert ("c", "e") not in dic.items()
+        assert "e" in dic.values()
+
+        with pytest.raises(KeyError):
+            dic["f"]
+
+        with pytest.raises(TypeError):
+            dic[["a"]]
+
+    def test_get_many(self, dic):
+        assert dic.get_many(["a", "f", 1]) == ["b", None, [2]]
+        assert dic.get_last_many(["a", "f"], "g") == ["e", "g"]
+        assert dic.get_list_many(["a", "f"]) == [["b", "e"], []]
+
+    def test_count(self, dic):
+        assert dic.count("a") == 2
+        assert dic.count("f") == 0
+        assert dic.key_count() == 3
+        assert list(dic.unique_keys()) == ["a", "c", 1]
+
+    def test_attach(self, dic):
+        attached_dic = FrozenSharedMagicDict.attach(dic.name)
+
+        assert attached_dic.items() == dic.items()
+        assert attached_dic.get_list("a") == ["b", "e"]
+
+        attached_dic.close()
+
+        assert dic["c"] == "d"
+
+    def test_attach_other_program(self, dic):
+        subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys; from magicdict import FrozenSharedMagicDict; "
+                "FrozenSharedMagicDict.attach(sys.argv[1]).close()",
+                dic.name,
+            ],
+            check=True,
+        )
+        # The resource tracker of the program exits after it.
+        time.sleep(0.2)
+
+        attached_dic = FrozenSharedMagicDict.attach(dic.name)
+
+        assert attached_dic["a"] == "b"
+
+        attached_dic.close()
+
+    def test_key_identity(self):
+        key = "ab" * 3
+        equal_key = "".join(["ab"] * 3)
+        dic = FrozenSharedMagicDict([((key, key), "b")])
+
+        assert dic[(key, equal_key)] == "b"
+        assert (key, equal_key) in dic
+
+        dic.close()
+        dic.unlink()
+
+    def test_pickle(self, dic):
+        pickled = pickle.dumps(dic)
+
+        assert dic.name.encode() in pickled
+        assert pickle.loads(pickled).get_list("a") == ["b", "e"]
+
+    def test_other_process(self, dic):
+        with multiprocessing.Pool(1) as pool:
+            assert pool.apply(_get_list, (dic, "a")) == ["b", "e"]
+
+    def test_derive(self, dic):
+        dic_added = dic.with_added("c", "f")
+
+        assert type(dic_added) is FrozenMagicDict
+        assert dic_added.get_list("c") == ["d", "f"]
+        assert dic.without("a").items() == [("c", "d"), (1, [2])]
+        assert dic.copy() == dic
+        assert dic.merged(c="f").get_list("c") == ["d", "f"]
+        assert dic.get_list("c") == ["d"]
+
+    def test_empty(self):
+        dic = FrozenSharedMagicDict()
+
+        assert len(dic) == 0
+        assert "a" not in dic
+        assert dic.items() == []
+
+        dic.close()
+        dic.unlink()
@@ -44,6 +44,16 @@ class FrozenTolerantMagicDictTestCase:
 
         assert dic["A"] == "b"
 
+    def test_method_hash(self):
+        dic = FrozenTolerantMagicDict([("A", "b"), ("a", "c")])
+
+        assert hash(dic) == hash(
+            FrozenTolerantMagicDict(a="b").with_added("A", "c")
+        )
+        assert {dic: "d"}[
+            FrozenTolerantMagicDict([("a", "b"), ("A", "c")])
+        ] == "d"
+
     def test_get_first(self):
         dic = FrozenTolerantMagicDict([("a", "b"), ("A", "d"), ("A", "f")])
 
@@ -63,6 +73,52 @@ class FrozenTolerantMagicDictTestCase:
 
         assert list(dic.get_iter("A")) == ["b", "d", "f"]
 
+    def test_get_many(self):
+        dic = FrozenTolerantMagicDict([("a", "b"), ("A", "d"), ("C", "f")])
+
+        assert dic.get_many(["A", "c", "e"]) == ["b", "f", None]
+        assert dic.get_last_many(["a"]) == ["d"]
+        assert dic.get_list_many(["A", "e"]) == [["b", "d"], []]
+
+    def test_count(self):
+        dic = FrozenTolerantMagicDict([("a", "b"), ("A", "d"), ("C", "f")])
+
+        assert dic.count("A") == 2
+        assert dic.key_count() == 2
+        assert "c" in dic.unique_keys()
+        assert "C" in dic.unique_keys()
+        assert dic.unique_keys() == {"a", "c"}
+
+    def test_with_set(self):
+        dic = FrozenTolerantMagicDict([("A", "b"), ("a", "c")])
+
+        dic_set = dic.with_set("A", "d")
+
+        assert isinstance(dic_set, FrozenTolerantMagicDict)
+        assert dic_set.get_list("a") == ["d"]
+        assert dic.without("A") == {}
+
+    def test_key_cache(self):
+        dic = FrozenTolerantMagicDict([("X-Custom-Header", "b")])
+
+        dic["X-CUSTOM-HEADER"]
+        hits = FrozenTolerantMagicDict.key_cache_info().hits
+
+        assert dic["X-CUSTOM-HEADER"] == "b"
+        assert dic["X-CUSTOM-HEADER"] == "b"
+
+        assert FrozenTolerantMagicDict.key_cache_info().hits >= hits + 2
+
+        (key,) = dic.keys()
+        assert key is FrozenTolerantMagicDict._alter_key("X-Custom-Header")
+
+    def test_items_contains_unhashable(self):
+        dic = FrozenTolerantMagicDict(A="b")
+
+        assert ("A", "b") in dic.items()
+        assert (["a"], "b") not in dic.items()
+        assert (1, "b") not in dic.items()
+
     def test_copy(self):
         dic = FrozenTolerantMagicDict([("a", "b"), ("a", "d"), ("a", "f")])
 
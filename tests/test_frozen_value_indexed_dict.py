@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#   Copyright 2018 Kaede Hoshikawa
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+from magicdict import FrozenValueIndexedMagicDict
+
+
+class FrozenValueIndexedMagicDictTestCase:
+    def test_init_with_iter(self):
+        sample = [("a", "b"), ("c", "d"), ("c", "d"), ("e", "f")]
+        dic = FrozenValueIndexedMagicDict(sample)
+
+        assert sample == [(k, v) for k, v in dic.items()]
+
+    def test_values_contains(self):
+        sample = [("a", "b"), ("c", "d"), ("c", "d"), ("e", 1)]
+        dic = FrozenValueIndexedMagicDict(sample)
+
+        assert "b" in dic.values()
+        assert "d" in dic.values()
+        assert 1.0 in dic.values()
+        assert "a" not in dic.values()
+        assert ["b"] not in dic.values()
+
+    def test_values_contains_unhashable(self):
+        sample = [("a", ["b"]), ("c", "d")]
+        dic = FrozenValueIndexedMagicDict(sample)
+
+        assert ["b"] in dic.values()
+        assert "d" in dic.values()
+        assert "b" not in dic.values()
+
+    def test_items_contains(self):
+        sample = [("a", "b"), ("a", "c"), ("e", ["f"])]
+        dic = FrozenValueIndexedMagicDict(sample)
+
+        assert ("a", "c") in dic.items()
+        assert ("e", ["f"]) in dic.items()
+        assert ("a", "d") not in dic.items()
+
+    def test_with_set_without(self):
+        dic = FrozenValueIndexedMagicDict([("a", "b"), ("c", "d")])
+
+        dic_set = dic.with_set("a", "e")
+
+        assert "b" not in dic_set.values()
+        assert "e" in dic_set.values()
+        assert "b" in dic.values()
+        assert "e" not in dic.values()
+
+        assert "d" not in dic.without("c").values()
+        assert "d" in dic.values()
+
+    def test_copy(self):
+        dic = FrozenValueIndexedMagicDict([("a", "b"), ("a", "c")])
+
+        dic_copy = dic.copy()
+
+        assert dic == dic_copy
+        assert "c" in dic_copy.values()
+
+    def test_fromkeys(self):
+        dic = FrozenValueIndexedMagicDict.fromkeys(["a", "b", "b"], "d")
+
+        assert dic.get_list("b") == ["d", "d"]
+        assert "d" in dic.values()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#   Copyright 2021 Kaede Hoshikawa
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import pickle
+
+from magicdict import (
+    Concurrency,
+    FrozenMagicDict,
+    FrozenTolerantMagicDict,
+    LockStats,
+    MagicDict,
+)
+
+
+class _InstrumentedMagicDict(MagicDict):
+    instrumented = True
+
+
+class _InstrumentedReadWriteMagicDict(MagicDict):
+    instrumented = True
+    concurrency = Concurrency.READ_WRITE
+
+
+class _InstrumentedFrozenMagicDict(FrozenTolerantMagicDict):
+    instrumented = True
+
+
+def _calls(cls):
+    return {
+        name: stats.calls
+        for name, stats in cls.instrumentation.snapshot().operations.items()
+    }
+
+
+class InstrumentationTestCase:
+    def setup_method(self):
+        for cls in (
+            _InstrumentedMagicDict,
+            _InstrumentedReadWriteMagicDict,
+            _InstrumentedFrozenMagicDict,
+        ):
+            cls.instrumentation.reset()
+
+    def test_not_instrumented(self):
+        assert MagicDict.__contains__ is FrozenMagicDict.__contains__
+        assert not hasattr(MagicDict, "instrumentation")
+
+    def test_operations(self):
+        dic = _InstrumentedMagicDict([("a", "b")])
+
+        dic["c"] = "d"
+        dic.add("a", "e")
+
+        assert dic["a"] == "b"
+        assert "e" in dic.values()
+        assert ("c", "d") in dic.items()
+
+        calls = _calls(_InstrumentedMagicDict)
+
+        assert calls["_add_pairs"] == 1
+        assert calls["__setitem__"] == 1
+        assert calls["_add_one"] == 1
+        assert calls["__getitem__"] == 1
+        assert calls["_has_value"] == 1
+        assert calls["_has_pair"] == 1
+
+        stats = _InstrumentedMagicDict.instrumentation.snapshot().operations[
+            "__getitem__"
+        ]
+
+        assert sum(stats.histogram) == 1
+        assert stats.total_ns == stats.max_ns
+
+    def test_frozen(self):
+        dic = _InstrumentedFrozenMagicDict([("A", "b")])
+
+        assert dic["a"] == "b"
+        assert dic.with_added("c", "d").get_last("C") == "d"
+
+        calls = _calls(_InstrumentedFrozenMagicDict)
+
+        assert calls["__getitem__"] == 1
+        assert calls["with_added"] == 1
+        assert calls["get_last"] == 1
+
+    def test_lock(self):
+        dic = _InstrumentedReadWriteMagicDict()
+
+        dic["a"] = "b"
+        dic["a"]
+
+        lock = _InstrumentedReadWriteMagicDict.instrumentation.snapshot().lock
+
+        # Setting takes the lock, getting shares it.
+        assert lock.acquisitions == 2
+        assert lock.held_ns > 0
+
+        _InstrumentedReadWriteMagicDict.instrumentation.reset()
+
+        assert (
+            _InstrumentedReadWriteMagicDict.instrumentation.snapshot().lock
+            == LockStats(0, 0, 0, 0)
+        )
+
+    def test_subclass(self):
+        class _SnapshotMagicDict(_InstrumentedMagicDict):
+            concurrency = Concurrency.SNAPSHOT
+
+        dic = _SnapshotMagicDict(a="b")
+
+        assert dic["a"] == "b"
+        assert _calls(_SnapshotMagicDict)["__getitem__"] == 1
+        assert "__getitem__" not in _calls(_InstrumentedMagicDict)
+
+    def test_pickle(self):
+        dic = _InstrumentedMagicDict([("a", "b"), ("a", "c")])
+
+        loaded_dic = pickle.loads(pickle.dumps(dic))
+
+        assert type(loaded_dic) is _InstrumentedMagicDict
+        assert loaded_dic.get_list("a") == ["b", "c"]
@@ -32,6 +32,17 @@ class MagicItemsViewTestCase:
 
         assert list(iter(dic.items())) == sample
 
+    def test_method_contains_multi_value(self):
+        sample = [("a", "b"), ("c", "d"), ("a", "e"), ("c", "f"), ("a", "g")]
+        dic = FrozenMagicDict(sample)
+
+        assert ("a", "e") in dic.items()
+        assert ("a", "g") in dic.items()
+        assert ("c", "f") in dic.items()
+        assert ("a", "f") not in dic.items()
+        assert ("x", "b") not in dic.items()
+        assert (["a"], "b") not in dic.items()
+
     def test_method_contains(self):
         sample = [("a", "b"), ("c", "d"), ("c", "d"), ("e", "f")]
         dic = FrozenMagicDict(sample)
@@ -129,8 +140,56 @@ class MagicItemsViewTestCase:
 
         assert dic.items() ^ dic2.items() == set([("e", "f")])
 
+    def test_set_ops_between_views(self):
+        dic = FrozenMagicDict([("a", "b"), ("c", "d"), ("c", "e")])
+        dic2 = FrozenMagicDict([("c", "d"), ("g", "h")])
+        items2 = list(dic2.items())
+
+        assert dic.items() & dic2.items() == dic.items() & items2
+        assert dic.items() | dic2.items() == dic.items() | items2
+        assert dic.items() - dic2.items() == dic.items() - items2
+        assert dic.items() ^ dic2.items() == dic.items() ^ items2
+        assert dic.items() & dic2.items() == {("c", "d")}
+        assert not dic.items() <= dic2.items()
+        assert not dic.items() < dic2.items()
+        assert not dic.items() > dic2.items()
+        assert dic.items() >= FrozenMagicDict(a="b").items()
+
+    def test_ordered_set_ops(self):
+        dic = FrozenMagicDict([("e", []), ("a", "b"), ("c", "d"), ("c", "d")])
+        dic2 = FrozenMagicDict([("g", "h"), ("c", "d"), ("e", [])])
+
+        for other in (dic2.items(), list(dic2.items()), iter(dic2.items())):
+            result = dic.items().intersection(other)
+
+            assert isinstance(result, FrozenMagicDict)
+            assert list(result.items()) == [("e", []), ("c", "d"), ("c", "d")]
+
+        assert list(dic.items().difference(dic2.items()).items()) == [
+            ("a", "b")
+        ]
+        assert list(dic.items().union(dic2.items()).items()) == [
+            ("e", []),
+            ("a", "b"),
+            ("c", "d"),
+            ("c", "d"),
+            ("g", "h"),
+        ]
+        assert list(
+            dic.items().symmetric_difference([("a", "b"), ("x", "y")]).items()
+        ) == [("e", []), ("c", "d"), ("c", "d"), ("x", "y")]
+
 
 class TolerantMagicItemsViewTestCase:
+    def test_method_contains_multi_value(self):
+        sample = [("A", "b"), ("c", "d"), ("a", "e"), ("C", "f"), ("a", "g")]
+        dic = FrozenTolerantMagicDict(sample)
+
+        assert ("A", "e") in dic.items()
+        assert ("a", "g") in dic.items()
+        assert ("c", "f") in dic.items()
+        assert ("a", "f") not in dic.items()
+
     def test_method_contains(self):
         sample = [("A", "b"), ("c", "d"), ("c", "d"), ("e", "f")]
         dic = FrozenTolerantMagicDict(sample)
@@ -227,3 +286,22 @@ class TolerantMagicItemsViewTestCase:
         dic2 = FrozenTolerantMagicDict(sample2)
 
         assert dic.items() ^ dic2.items() == set([("e", "f")])
+
+    def test_set_ops_between_views(self):
+        dic = FrozenTolerantMagicDict([("A", "b"), ("c", "d")])
+        dic2 = FrozenTolerantMagicDict([("C", "d"), ("g", "h")])
+
+        assert dic.items() & dic2.items() == {("c", "d")}
+        assert dic.items() - dic2.items() == {("a", "b")}
+
+    def test_ordered_set_ops(self):
+        dic = FrozenTolerantMagicDict([("A", "b"), ("c", "d")])
+        result = dic.items().intersection([("C", "d"), ("a", "b")])
+
+        assert isinstance(result, FrozenTolerantMagicDict)
+        assert list(result.items()) == [("a", "b"), ("c", "d")]
+        assert list(dic.items().union([("G", "h")]).items()) == [
+            ("a", "b"),
+            ("c", "d"),
+            ("g", "h"),
+        ]
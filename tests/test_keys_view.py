@@ -131,6 +131,36 @@ class MagicKeysViewTestCase:
 
         assert dic.keys() ^ dic2.keys() == set(["e"])
 
+    def test_set_ops_between_views(self):
+        dic = FrozenMagicDict([("a", "b"), ("c", "d"), ("c", "e")])
+        dic2 = FrozenMagicDict([("c", "f"), ("g", "h")])
+        keys2 = list(dic2.keys())
+
+        assert dic.keys() & dic2.keys() == dic.keys() & keys2 == {"c"}
+        assert dic.keys() | dic2.keys() == dic.keys() | keys2
+        assert dic.keys() - dic2.keys() == dic.keys() - keys2 == {"a"}
+        assert dic.keys() ^ dic2.keys() == dic.keys() ^ keys2 == {"a", "g"}
+        assert not dic.keys() <= dic2.keys()
+        assert not dic.keys() < dic2.keys()
+        assert not dic.keys() > dic2.keys()
+        assert dic.keys() >= FrozenMagicDict(a="b").keys()
+
+    def test_ordered_set_ops(self):
+        dic = FrozenMagicDict([("e", "f"), ("a", "b"), ("c", "d"), ("a", "e")])
+        dic2 = FrozenMagicDict([("g", "h"), ("c", "f"), ("e", "i")])
+
+        for other in (dic2.keys(), ["g", "c", "e"], iter(["g", "c", "e"])):
+            assert list(dic.keys().intersection(other)) == ["e", "c"]
+
+        assert list(dic.keys().difference(dic2.keys())) == ["a"]
+        assert list(dic.keys().union(dic2.keys())) == ["e", "a", "c", "g"]
+        assert list(dic.keys().symmetric_difference(["g", "a", "x"])) == [
+            "e",
+            "c",
+            "g",
+            "x",
+        ]
+
 
 class TolerantMagicKeysViewTestCase:
     def test_method_contains(self):
@@ -229,3 +259,18 @@ class TolerantMagicKeysViewTestCase:
         dic2 = FrozenTolerantMagicDict(sample2)
 
         assert dic.keys() ^ dic2.keys() == set(["e"])
+
+    def test_set_ops_between_views(self):
+        dic = FrozenTolerantMagicDict([("A", "b"), ("c", "d")])
+        dic2 = FrozenTolerantMagicDict([("C", "f"), ("g", "h")])
+
+        assert dic.keys() & dic2.keys() == {"c"}
+        assert dic.keys() - dic2.keys() == {"a"}
+        assert dic.keys() & FrozenMagicDict(dic2).keys() == {"c"}
+        assert FrozenMagicDict(C="f").keys() & dic.keys() == set()
+
+    def test_ordered_set_ops(self):
+        dic = FrozenTolerantMagicDict([("A", "b"), ("c", "d")])
+
+        assert list(dic.keys().intersection(["C", "a"])) == ["a", "c"]
+        assert list(dic.keys().union(["G", "C"])) == ["a", "c", "g"]
@@ -17,7 +17,7 @@
 
 import pytest
 
-from magicdict import TolerantMagicDict
+from magicdict import MagicDict, TolerantMagicDict
 
 
 class TolerantMagicDictTestCase:
@@ -53,6 +53,22 @@ class TolerantMagicDictTestCase:
         assert "b" not in dic.values()
         assert "c" not in dic.values()
 
+    def test_init_from_magic_dict(self):
+        sample = MagicDict([("A", "b"), ("a", "c")])
+        dic = TolerantMagicDict(sample)
+
+        assert dic.get_list("a") == ["b", "c"]
+
+        dic_copy = MagicDict(dic)
+
+        assert dic_copy.get_list("a") == ["b", "c"]
+        assert "A" not in dic_copy
+
+    def test_method_eq(self):
+        assert MagicDict(a=1) == TolerantMagicDict(a=1)
+        assert TolerantMagicDict(A=1) == MagicDict(a=1)
+        assert TolerantMagicDict(A=1) != MagicDict(A=1)
+
     def test_get_last(self):
         dic = TolerantMagicDict([("a", "b"), ("a", "d"), ("a", "f")])
 
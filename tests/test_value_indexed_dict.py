@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#   Copyright 2018 Kaede Hoshikawa
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import pickle
+
+import pytest
+
+from magicdict import ValueIndexedMagicDict
+
+
+class ValueIndexedMagicDictTestCase:
+    def test_setitem(self):
+        dic = ValueIndexedMagicDict([("a", "b"), ("a", "c")])
+
+        dic["a"] = "d"
+
+        assert "b" not in dic.values()
+        assert "c" not in dic.values()
+        assert "d" in dic.values()
+
+    def test_add(self):
+        dic = ValueIndexedMagicDict()
+
+        dic.add("a", "b")
+        dic.add("c", "b")
+
+        assert "b" in dic.values()
+
+        del dic["a"]
+
+        assert "b" in dic.values()
+
+        del dic["c"]
+
+        assert "b" not in dic.values()
+
+    def test_pop(self):
+        dic = ValueIndexedMagicDict([("a", "b"), ("a", "c")])
+
+        assert dic.pop("a") == "c"
+
+        assert "c" not in dic.values()
+        assert "b" in dic.values()
+
+    def test_popitem(self):
+        dic = ValueIndexedMagicDict([("a", "b"), ("a", "c"), ("d", ["e"])])
+
+        assert dic.popitem() == ("d", ["e"])
+        assert ["e"] not in dic.values()
+
+        assert dic.popitem(last=False) == ("a", "b")
+        assert "b" not in dic.values()
+        assert "c" in dic.values()
+
+    def test_clear(self):
+        dic = ValueIndexedMagicDict([("a", "b"), ("a", "c")])
+
+        dic.clear()
+
+        assert "b" not in dic.values()
+
+        with pytest.raises(KeyError):
+            dic.popitem()
+
+    def test_many_rewrites(self):
+        dic = ValueIndexedMagicDict()
+
+        for i in range(100):
+            dic["a"] = i
+
+        assert 99 in dic.values()
+        assert 98 not in dic.values()
+        assert len(dic) == 1
+
+    def test_copy(self):
+        dic = ValueIndexedMagicDict([("a", "b"), ("a", "c")])
+
+        dic_copy = dic.copy()
+        dic_copy["a"] = "d"
+
+        assert "b" in dic.values()
+        assert "b" not in dic_copy.values()
+
+    def test_copy_update_removed(self):
+        dic = ValueIndexedMagicDict([("a", 1), ("b", 2), ("c", 3), ("d", 4)])
+        del dic["a"]
+        del dic["b"]
+
+        dic_copy = dic.copy()
+        dic_copy.update([("e", 5)])
+
+        assert 5 in dic_copy.values()
+        assert 5 not in dic.values()
+
+    def test_copy_compact(self):
+        dic = ValueIndexedMagicDict([("a", 1), ("b", 2), ("c", 3)])
+        del dic["a"]
+
+        dic_copy = dic.copy()
+        dic_copy.compact()
+        dic_copy.add("x", 99)
+
+        assert 99 in dic_copy.values()
+        assert 99 not in dic.values()
+
+    def test_pickle(self):
+        dic = ValueIndexedMagicDict([("a", "b"), ("c", "d"), ("a", "e")])
+        del dic["c"]
+
+        loaded_dic = pickle.loads(pickle.dumps(dic))
+        loaded_dic.add("c", "f")
+
+        assert type(loaded_dic) is ValueIndexedMagicDict
+        assert loaded_dic.items() == [("a", "b"), ("a", "e"), ("c", "f")]
+        assert "d" not in loaded_dic.values()
+        assert "f" in loaded_dic.values()